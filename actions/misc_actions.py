@@ -111,6 +111,7 @@ class GetGalileo2Health(ActionInterface):
             g20_health_btn = st.button("G2.0 Health")
             
             if g20_health_btn:
+                self.shortcut_gateway.invalidate_story_snapshot()
                 st.markdown("<h4>G2.0 Backlog Rate</h4>", unsafe_allow_html=True)
                 df = self.shortcut_gateway.get_backlog_rate_for_epic(start, end, epic_id=g20_epic_id)
                 st.line_chart(df, x="Date", y="Backlog Rate", color="#FF0000")
@@ -140,7 +141,7 @@ class AbstractHealth(ActionInterface):
     def get_backlog_rate_chart(self, df):
         chart = alt.Chart(df).mark_line().encode(
             x=alt.X("Date:T", title="Date"),
-            y=alt.Y("Backlog Rate:Q", title="Backlog Rate"),
+            y=alt.Y("Backlog Rate:Q", title="Backlog Rate (days per open story)"),
         )
         return chart
 
@@ -161,6 +162,7 @@ class GetExecutionHealth(AbstractHealth):
         with full_width_container:
 
             if execution_health_btn:
+                self.shortcut_gateway.invalidate_story_snapshot()
                 epic = self.shortcut_gateway.get_epic_from_id(self.epic_id)
                 completion_rate_df = self.shortcut_gateway.get_completion_rate_for_epic(
                     start, 
@@ -1,14 +1,26 @@
 from actions.actions import ActionInterface
 import streamlit as st
-from shortcut_utils import ShortcutGateway, SprintUtils, DisplayUtils
+from shortcut_utils import ShortcutGateway, SprintUtils, DisplayUtils, EpicsSummary
 from utils.common_utils import CODE_RED_DAYS_AFTER
 from datetime import datetime
-from tqdm import tqdm
 from collections import defaultdict
 import json
 from llm_utils import ask_openai, THEME_EXTRACTION_PROMPT, classify_story
 
 
+def _stream_epics_summary(shortcut_gateway: ShortcutGateway, epics, start, end) -> tuple:
+    # rows are shown as each epic's stories arrive, then cleared for the full summary; returns EpicsSummary.result()
+    summary = EpicsSummary(verbose=True)
+    streamed_table = st.empty()
+    for result in shortcut_gateway.stream_epics(epics, start, end, CODE_RED_DAYS_AFTER, verbose=True):
+        summary.add(result)
+        if result['row_html']:
+            # rows keep the input order, filling in as their epics arrive
+            streamed_table.markdown(summary.table_html(), unsafe_allow_html=True)
+    streamed_table.empty()
+    return summary.result()
+
+
 class ExplainAnObjective(ActionInterface):
     def __init__(self, 
                  shortcut_gateway: ShortcutGateway,
@@ -22,10 +34,14 @@ class ExplainAnObjective(ActionInterface):
             st.session_state.objective_display_string = None
         if "objective_results" not in st.session_state:
             st.session_state.objective_results = None
+        if "objective_period_counts" not in st.session_state:
+            st.session_state.objective_period_counts = (0, 0, 0)
 
     def do_action(self, start, end):
         start_str = start.strftime("%d %b %Y")
         end_str = end.strftime("%d %b %Y")
+        # two bulk calls, then every epic/objective name below is a cache hit
+        self.shortcut_gateway.warm_entity_cache()
         objective_name_to_id_map = self.shortcut_gateway.get_all_objectives()
         objective_names = [objective_name for objective_name in objective_name_to_id_map.keys()]
 
@@ -39,15 +55,14 @@ class ExplainAnObjective(ActionInterface):
 
         with full_width_container:
             if explain_clicked:
-                results, display_string, _, _ = self.shortcut_gateway.explain_epics_from_objective(
-                    objective_id,
-                    start,
-                    end,
-                    CODE_RED_DAYS_AFTER,
-                    verbose=True
+                self.shortcut_gateway.invalidate_story_snapshot()
+                epics = self.shortcut_gateway.get_epics_for_objective(objective_id, exclude_completed=True)
+                results, display_string, _, _, in_week_completed, in_week_filed, out_week_completed, _ = _stream_epics_summary(
+                    self.shortcut_gateway, epics, start, end
                 )
                 st.session_state.objective_display_string = display_string
                 st.session_state.objective_results = results
+                st.session_state.objective_period_counts = (in_week_completed, in_week_filed, out_week_completed)
 
             if st.session_state.objective_display_string and st.session_state.objective_results:
                 self.display_utils.display_epics_results(
@@ -55,7 +70,8 @@ class ExplainAnObjective(ActionInterface):
                     st.session_state.objective_results, 
                     CODE_RED_DAYS_AFTER, 
                     start_str, 
-                    end_str
+                    end_str,
+                    *st.session_state.objective_period_counts
                 )
 
 
@@ -87,31 +103,45 @@ class AnalyzeAPerson(ActionInterface):
 
             with full_width_container:
                 owner_id = self.shortcut_gateway.get_owner_id(owner)
-                stories = self.shortcut_gateway.get_stories_between_dates(
-                    start.strftime('%Y-%m-%d'),
-                    end.strftime('%Y-%m-%d')
-                )
-                filtered_stories = [story for story in stories if len(story['owner_ids']) > 0 and story['owner_ids'][0] == owner_id]
+                self.shortcut_gateway.invalidate_story_snapshot()
+                # two bulk calls up front, so resolving each batch below is all cache hits
+                self.shortcut_gateway.warm_entity_cache()
 
                 html_table = "<table style='width: 100%;'><tr><th>Story</th><th>Created on</th><th>Owner</th><th>Requester</th><th>Complete</th><th>Epic</th></tr>"
 
+                # only this person's stories, from the owner index; while the index is
+                # still backfilling, the table grows as each epic's stories arrive
+                rows = []
+                rows_html = []
+                streamed_table = st.empty()
+                for batch in self.shortcut_gateway.iter_stories_for_owner(
+                    owner_id,
+                    datetime.combine(start, datetime.min.time()),
+                    datetime.combine(end, datetime.min.time())
+                ):
+                    batch = [story for story in batch if story.owner_id == owner_id]
+                    if not batch:
+                        continue
+                    for row in self.shortcut_gateway.resolve_stories(batch):
+                        rows.append(row)
+                        rows_html.append(self._row_html(row, owner))
+                    streamed_table.markdown(html_table + "".join(rows_html) + "</table>", unsafe_allow_html=True)
+                streamed_table.empty()
+
+                # batches arrive in fetch order; the final table is oldest first
+                rows.sort(key=lambda row: (row.story.created_at or datetime.min, row.story.id))
+                filtered_stories = [row.story for row in rows]
+
                 total_owner_stories = 0
                 completed_owner_stories = 0
                 self_created_count = 0
-
-                for story in tqdm(filtered_stories):
+                for row in rows:
                     total_owner_stories += 1
-                    is_complete = self.shortcut_gateway.get_workflow_name(story['workflow_state_id']) in self.active_states
-                    if is_complete:
+                    if row.state in self.active_states:
                         completed_owner_stories += 1
-                    is_complete_str = "<span style='color: #00FF00;'>Yes</span>" if is_complete else "<span style='color: #FF0000;'>No</span>"
-                    created_at_str = datetime.strptime(story['created_at'], "%Y-%m-%dT%H:%M:%SZ").strftime("%d %b %Y")
-                    requester_str = self.shortcut_gateway.get_owner_name(story['requested_by_id'])
-                    self_created = story['requested_by_id'] == owner_id
-                    if self_created:
+                    if row.story.requested_by_id == owner_id:
                         self_created_count += 1
-                    epic_str = self.shortcut_gateway.get_epic_name(story['epic_id'])
-                    html_table += f"<tr><td><a href='{story['app_url']}'>{story['name']}</a></td><td>{created_at_str}</td><td>{owner}</td><td>{requester_str}</td><td>{is_complete_str}</td><td>{epic_str}</td></tr>"
+                    html_table += self._row_html(row, owner)
 
                 html_table += "</table>"
                 
@@ -135,6 +165,13 @@ class AnalyzeAPerson(ActionInterface):
             st.markdown(st.session_state.person_analysis_html, unsafe_allow_html=True)
             st.markdown(st.session_state.person_analysis_table, unsafe_allow_html=True)
 
+    def _row_html(self, row, owner) -> str:
+        story = row.story
+        is_complete = row.state in self.active_states
+        is_complete_str = "<span style='color: #00FF00;'>Yes</span>" if is_complete else "<span style='color: #FF0000;'>No</span>"
+        created_at_str = story.created_at.strftime("%d %b %Y")
+        return f"<tr><td><a href='{story.app_url}'>{story.name}</a></td><td>{created_at_str}</td><td>{owner}</td><td>{row.requester}</td><td>{is_complete_str}</td><td>{row.epic_name}</td></tr>"
+
 class ExplainEpics(ActionInterface):
     
     def __init__(self, 
@@ -162,14 +199,11 @@ class ExplainEpics(ActionInterface):
             if explain_epic_clicked and epic_ids is not None:
                 try:
                     epic_ids = [int(id) for id in epic_ids.split(",")]
+                    self.shortcut_gateway.invalidate_story_snapshot()
                     epics = [self.shortcut_gateway.get_epic_from_id(epic_id) for epic_id in epic_ids]
 
-                    results, display_string, c1_map, c2_map, in_week_completed, in_week_filed, out_week_completed, completed_stories = self.shortcut_gateway.explain_epics(
-                        epics, 
-                        start, 
-                        end, 
-                        CODE_RED_DAYS_AFTER, 
-                        verbose=True
+                    results, display_string, c1_map, c2_map, in_week_completed, in_week_filed, out_week_completed, completed_stories = _stream_epics_summary(
+                        self.shortcut_gateway, epics, start, end
                     )
                     print("Type of completed_stories:", type(completed_stories))  # Debug print
                     if completed_stories:
@@ -215,3 +249,54 @@ class ExplainEpics(ActionInterface):
                     st.error(f"Invalid input. Error: {str(e)}")
                 except Exception as e:
                     st.error(f"Unexpected error: {str(e)}")
+
+class CustomerHealth(ActionInterface):
+
+    def __init__(self, shortcut_gateway: ShortcutGateway):
+        self.shortcut_gateway = shortcut_gateway
+        if 'customer_health' not in st.session_state:
+            st.session_state.customer_health = None
+
+    def do_action(self, start: datetime, end: datetime):
+        customer_health_clicked = st.button("Customer Health", type="primary")
+
+        full_width_container = st.container()
+
+        with full_width_container:
+            if customer_health_clicked:
+                st.session_state.customer_health = self.shortcut_gateway.get_customer_health(start, end)
+
+            df = st.session_state.customer_health
+            if df is not None:
+                if df.empty:
+                    st.markdown(f"No customer tickets filed between {start} and {end}.")
+                else:
+                    behind = df[df["Open"] > 0]
+                    if not behind.empty:
+                        names = ", ".join(behind["Customer"].head(3))
+                        st.markdown(f"Most behind on: <span style='color: #FF69B4;'>{names}</span>", unsafe_allow_html=True)
+                    st.dataframe(df, use_container_width=True, hide_index=True)
+
+class SearchStories(ActionInterface):
+
+    def __init__(self, shortcut_gateway: ShortcutGateway):
+        self.shortcut_gateway = shortcut_gateway
+
+    def do_action(self):
+        query = st.text_input("Search story titles", placeholder="e.g. login timeout or [ui]")
+
+        full_width_container = st.container()
+
+        with full_width_container:
+            if query:
+                stories = self.shortcut_gateway.search_story_titles(query)
+                if not stories:
+                    st.markdown(f"No stories match <b>{query}</b>.", unsafe_allow_html=True)
+                    return
+                html_table = "<table style='width: 100%;'><tr><th>Story</th><th>Created on</th><th>Owner</th><th>Status</th><th>Epic</th></tr>"
+                for row in self.shortcut_gateway.resolve_stories(stories):
+                    story = row.story
+                    created_at_str = story.created_at.strftime("%d %b %Y") if story.created_at else ""
+                    html_table += f"<tr><td><a href='{story.app_url}'>{story.name}</a></td><td>{created_at_str}</td><td>{row.owner}</td><td>{row.state}</td><td>{row.epic_name}</td></tr>"
+                html_table += "</table>"
+                st.markdown(html_table, unsafe_allow_html=True)
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 from llm_utils import CODE_REVIEW_GUIDELINES_V1, CODE_REVIEW_INSTRUCTIONS_V1
 from shortcut_utils import DisplayUtils, ShortcutGateway, SprintUtils
@@ -13,11 +14,26 @@ from utils.common_utils import CODE_RED_DAYS_AFTER, COMMON_PAGE_CSS
 from actions.email_actions import GetEmails
 from actions.calendar_actions import GetMyDay
 from actions.github_actions import GetGithubActivity, GetSmartReviews, GetRepoPRs, GetAuthorPRs
-from actions.shortcut_actions import ExplainAnObjective, AnalyzeAPerson, ExplainEpics
+from actions.shortcut_actions import ExplainAnObjective, AnalyzeAPerson, ExplainEpics, CustomerHealth, SearchStories
 from actions.misc_actions import GetGoogleDocs, GetCompetitors, HighlightText, GetExecutionHealth
 
 
-shortcut_gateway = ShortcutGateway()
+@st.cache_resource
+def get_shortcut_gateway():
+    # Shared across reruns so the gateway's TTL caches survive between clicks
+    gateway = ShortcutGateway()
+    if os.getenv('SHORTCUT_MIRROR_PATH'):
+        from shortcut_mirror import ShortcutMirror
+        mirror = ShortcutMirror(gateway)
+        gateway.attach_mirror(mirror)
+        mirror.start_background_sync()
+    if os.getenv('SHORTCUT_WEBHOOK_PORT'):
+        # Shortcut pushes changes here, so clicks stop re-fetching (see shortcut_webhooks.py)
+        from shortcut_webhooks import WebhookReceiver
+        WebhookReceiver(gateway).start()
+    return gateway
+
+shortcut_gateway = get_shortcut_gateway()
 display_utils = DisplayUtils()
 sprint_utils = SprintUtils(shortcut_gateway)
 github_token = st.secrets["github"]["token"]
@@ -40,10 +56,10 @@ with col2:
 
 tab_names = [
     "My Day", "Emails", "GH Activity", "GH Smart Reviews", "GH Author Activity", "GH Repo Activity", "SH Objectives", 
-    "SH Epics", "SH Author Activity"
+    "SH Epics", "SH Author Activity", "SH Customers", "SH Search"
 ]
 
-my_day, get_emails, gh_activity, smart_reviews, gh_author_activity, gh_repo_activity, objectives, epics, sh_author_activity = st.tabs(tab_names)
+my_day, get_emails, gh_activity, smart_reviews, gh_author_activity, gh_repo_activity, objectives, epics, sh_author_activity, sh_customers, sh_search = st.tabs(tab_names)
 
 
 with get_emails:
@@ -64,3 +80,7 @@ with smart_reviews:
     GetSmartReviews().do_action()
 with sh_author_activity:
     AnalyzeAPerson(shortcut_gateway, sprint_utils, display_utils).do_action(start, end)
+with sh_customers:
+    CustomerHealth(shortcut_gateway).do_action(start, end)
+with sh_search:
+    SearchStories(shortcut_gateway).do_action()
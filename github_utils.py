@@ -1,7 +1,12 @@
 # Github API
+import heapq
+import os
 import requests
 import streamlit as st
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import warnings
 import pandas as pd
@@ -11,15 +16,89 @@ import pytz
 
 warnings.filterwarnings("ignore", category=NotOpenSSLWarning)
 
+
+class ConditionalCache:
+    """
+    Last body plus its ETag / Last-Modified per (token, url), so repeat GETs
+    can send If-None-Match / If-Modified-Since and reuse the body on a 304,
+    which GitHub doesn't count against the rate limit. Least recently used
+    entries are dropped past `max_entries`.
+    """
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def validators(self, key) -> dict:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def reuse(self, key):
+        # body stored for `key` after a 304, or None if it was evicted meanwhile
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.not_modified += 1
+            return entry[2]
+
+    def store(self, key, response: requests.Response, body) -> None:
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[key] = (etag, last_modified, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared by every GithubAPI: actions build a new one on each Streamlit rerun
+_response_cache = ConditionalCache(max_entries=int(os.getenv('GITHUB_CACHE_ENTRIES', 512)))
+
+# Pooled sessions per token, shared the same way so the TLS connection to
+# api.github.com outlives a rerun and sessions aren't leaked one per click
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_for(token: str, headers: dict, pool_maxsize: int) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(token)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(headers)
+            session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize))
+            _sessions[token] = session
+        return session
+
+
 class GithubAPI:
-    def __init__(self, token):
+    def __init__(self, token, cache: ConditionalCache = None):
         self.token = token
+        self.cache = cache if cache is not None else _response_cache
         self.user = "rungalileo"
         self.root_url = "https://api.github.com"
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        # Cap on parallel per-repo requests in fetch_recent_activity
+        self.max_concurrency = int(os.getenv('GITHUB_MAX_CONCURRENCY', 8))
+        # '0' walks the repos one at a time, as before
+        self.concurrent_fetch = os.getenv('GITHUB_CONCURRENT_FETCH', '1') != '0'
+        self.session = _session_for(self.token, self.headers, self.max_concurrency)
         self.all_repos = [
             "api",
             "core",
@@ -38,10 +117,30 @@ class GithubAPI:
         ] 
         self.user_skip_list = ['vercel[bot]', 'dependabot[bot]', 'github-actions[bot]', 'sentry-io[bot]', 'codecov[bot]', 'shortcut-integration[bot]', 'galileo-automation']
 
+    def _get_json(self, url: str) -> tuple[int, object]:
+        """
+        GET through the conditional cache: (status code, parsed body). A 304
+        comes back as 200 with the stored body; any other non-200 carries the
+        raw response text, since error pages (a 502, a rate-limit page) may not
+        be JSON.
+        """
+        key = (self.token, url)
+        response = self.session.get(url, headers=self.cache.validators(key), timeout=10)
+        if response.status_code == 304:
+            body = self.cache.reuse(key)
+            if body is not None:
+                return 200, body
+            response = self.session.get(url, timeout=10)
+        if response.status_code != 200:
+            return response.status_code, response.text
+        body = response.json()
+        self.cache.store(key, response, body)
+        return response.status_code, body
+
     def _get_recent_activity(self, repo_name:str):
         url = f"{self.root_url}/repos/{self.user}/{repo_name}/events?per_page=100&page=1"
-        response = requests.get(url, headers=self.headers)
-        return response.json()
+        _, events = self._get_json(url)
+        return events
         headers = {"Authorization": f"token {self.token}"}
         base_url = f"{self.root_url}/search/issues?q="
         
@@ -67,10 +166,38 @@ class GithubAPI:
 
         return results
 
+    def fetch_recent_activity(self, repos: list[str] = None, on_progress=None) -> dict[str, list[dict]]:
+        """
+        Recent events for each repo (default: all_repos), fetched in parallel
+        up to max_concurrency at a time. `on_progress(repo, done, total)` runs
+        on the calling thread as each repo arrives; a repo that fails maps to [].
+        """
+        repos = repos if repos is not None else self.all_repos
+        workers = min(self.max_concurrency, len(repos)) if self.concurrent_fetch else 1
+        events_by_repo = {}
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            futures = {pool.submit(self._get_recent_activity, repo_name=repo): repo for repo in repos}
+            for done, future in enumerate(as_completed(futures), start=1):
+                repo = futures[future]
+                try:
+                    events = future.result()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    print(f"Failed to fetch events for {repo}: {e}")
+                    events = []
+                # error replies come back as a dict, e.g. {"message": "Not Found"}
+                events_by_repo[repo] = events if isinstance(events, list) else []
+                if on_progress:
+                    on_progress(repo, done, len(repos))
+        return {repo: events_by_repo[repo] for repo in repos}
+
+    @staticmethod
+    def merge_events(events_by_repo: dict[str, list[dict]]) -> list[dict]:
+        # one newest-first timeline; each repo's events already arrive newest first
+        return list(heapq.merge(*events_by_repo.values(), key=lambda event: event['created_at'], reverse=True))
+
     def get_user_activity(self, last_n_hours: int = 24) -> dict:
         user_activity = {}
-        for repo in self.all_repos:
-            events = self._get_recent_activity(repo_name=repo)
+        for repo, events in self.fetch_recent_activity().items():
             events = [event for event in events if datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ') > (datetime.now() - timedelta(hours=last_n_hours+12)) and event['actor']['login'] not in self.user_skip_list]
 
             events = sorted(events, key=lambda x: x['created_at'], reverse=True)
@@ -143,14 +270,14 @@ class GithubAPI:
         pr_api_url = pr_url.replace("github.com", "api.github.com/repos").replace("/pull/", "/pulls/")
         diff_url = f"{pr_api_url}/files"
         
-        response = requests.get(diff_url, headers=self.headers)
+        status_code, files = self._get_json(diff_url)
         
-        if response.status_code != 200:
-            raise Exception(f"Failed to fetch PR diff: {response.status_code} {response.text}")
+        if status_code != 200:
+            raise Exception(f"Failed to fetch PR diff: {status_code} {files}")
         
         patch_data = []
         
-        for file in response.json():
+        for file in files:
             patch = file.get("patch", "")
             if patch:
                 patch_data.append({
@@ -189,63 +316,63 @@ class GithubAPI:
             st.markdown(f"<h4>Github Events from {start_date} to {end_date}</h4>", unsafe_allow_html=True)
         repo_events_count = {}
 
-        for i, repo in enumerate(self.all_repos):
-            feed_progress.progress(i / len(self.all_repos))
-            repo_progress_md.markdown(f"Processing <b>{repo}</b>...", unsafe_allow_html=True)
-            events = self._get_recent_activity(repo_name=repo)
-
-            for event in events:
-                print(f"Event type: {event['type']} at {datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ').strftime("%-d %b (%I:%M %p)")} by {event['actor']['login']}")
-                if 'payload' in event and 'pull_request' in event['payload']:
-                    print(f"Pull request title: {event['payload']['pull_request']['title']}")
-
-            events = [event for event in events if datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ') > datetime.now() - timedelta(hours=last_n_hours+12) and event['actor']['login'] not in self.user_skip_list]
-
-            repo_events_count[repo] = len(events)
-
-            for event in events:
-                event_type = event['type']
-                user = f"<a href='https://github.com/{event['actor']['login']}'>{event['actor']['login']}</a>"
-                repo = event['repo']['name']
-                utc_time = datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-                pst_time = utc_time.astimezone(pytz.timezone('US/Pacific'))
-                event_time = f"<span style='color: #FF69B4;'>[{pst_time.strftime("%-d %b (%I:%M %p)")}]</span>"
-                repo_name = f"<span style='color: #7FFFD4;'>[{repo.split('/')[-1]}]</span>"
-
-                if event_type == 'PullRequestEvent' or event_type == 'PullRequestReviewEvent':
-                    author = event['payload']['pull_request']['user']['login']
-                elif event_type == 'IssuesEvent' or event_type == 'IssueCommentEvent':
-                    author = event['payload']['issue']['user']['login']
-                elif event_type == 'PushEvent' and 'payload' in event and 'commits' in event['payload'] and len(event['payload']['commits']) > 0 and 'author' in event['payload']['commits'][0]:
-                    author = event['payload']['commits'][0]['author']['name']
+        def on_progress(repo, done, total):
+            feed_progress.progress(done / total)
+            repo_progress_md.markdown(f"Fetched <b>{repo}</b> ({done}/{total})...", unsafe_allow_html=True)
+
+        events_by_repo = self.fetch_recent_activity(on_progress=on_progress)
+        cutoff = datetime.now() - timedelta(hours=last_n_hours+12)
+        for repo, events in events_by_repo.items():
+            events_by_repo[repo] = [event for event in events if datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ') > cutoff and event['actor']['login'] not in self.user_skip_list]
+            repo_events_count[repo] = len(events_by_repo[repo])
+
+        for event in self.merge_events(events_by_repo):
+            print(f"Event type: {event['type']} at {datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ').strftime("%-d %b (%I:%M %p)")} by {event['actor']['login']}")
+            if 'payload' in event and 'pull_request' in event['payload']:
+                print(f"Pull request title: {event['payload']['pull_request']['title']}")
+
+            event_type = event['type']
+            user = f"<a href='https://github.com/{event['actor']['login']}'>{event['actor']['login']}</a>"
+            repo = event['repo']['name']
+            utc_time = datetime.strptime(event['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+            pst_time = utc_time.astimezone(pytz.timezone('US/Pacific'))
+            event_time = f"<span style='color: #FF69B4;'>[{pst_time.strftime("%-d %b (%I:%M %p)")}]</span>"
+            repo_name = f"<span style='color: #7FFFD4;'>[{repo.split('/')[-1]}]</span>"
+
+            if event_type == 'PullRequestEvent' or event_type == 'PullRequestReviewEvent':
+                author = event['payload']['pull_request']['user']['login']
+            elif event_type == 'IssuesEvent' or event_type == 'IssueCommentEvent':
+                author = event['payload']['issue']['user']['login']
+            elif event_type == 'PushEvent' and 'payload' in event and 'commits' in event['payload'] and len(event['payload']['commits']) > 0 and 'author' in event['payload']['commits'][0]:
+                author = event['payload']['commits'][0]['author']['name']
+            else:
+                author = None
+
+            if event_type == 'PullRequestEvent':
+                pr = event['payload']['pull_request']['url'].replace("api.", "").replace("/repos", "").replace("/pulls", "/pull")
+                pr_title = self.get_trimmed_pr_title(event['payload']['pull_request']['title'])
+                feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> created a <a href='{pr}'>PR</a> on <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
+            elif event_type == 'PushEvent':
+                pr_title = ""
+                if 'commits' in event['payload'] and len(event['payload']['commits']) > 0:  
+                    pr_title = self.get_trimmed_pr_title(event['payload']['commits'][0]['message'])
+                feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> pushed a commit to <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
+            elif event_type == 'IssuesEvent':
+                feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> created an issue on <b>{repo}</b>")
+            elif event_type == 'IssueCommentEvent':
+                pr = event['payload']['issue']['url'].replace("api.", "").replace("/repos", "")
+                pr_title = self.get_trimmed_pr_title(event['payload']['issue']['title'])
+                if author:
+                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> commented on <b>{author}'s</b> <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
+                else:                        
+                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> commented on an issue on <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
+            elif event_type == 'PullRequestReviewEvent':
+                pr = event['payload']['pull_request']['url'].replace("api.", "").replace("/repos", "").replace("/pulls", "/pull")
+                pr_title = self.get_trimmed_pr_title(event['payload']['pull_request']['title'])
+                if author:
+                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> reviewed <b>{author}'s</b> <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
                 else:
-                    author = None
-
-                if event_type == 'PullRequestEvent':
-                    pr = event['payload']['pull_request']['url'].replace("api.", "").replace("/repos", "").replace("/pulls", "/pull")
-                    pr_title = self.get_trimmed_pr_title(event['payload']['pull_request']['title'])
-                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> created a <a href='{pr}'>PR</a> on <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
-                elif event_type == 'PushEvent':
-                    pr_title = ""
-                    if 'commits' in event['payload'] and len(event['payload']['commits']) > 0:  
-                        pr_title = self.get_trimmed_pr_title(event['payload']['commits'][0]['message'])
-                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> pushed a commit to <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
-                elif event_type == 'IssuesEvent':
-                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> created an issue on <b>{repo}</b>")
-                elif event_type == 'IssueCommentEvent':
-                    pr = event['payload']['issue']['url'].replace("api.", "").replace("/repos", "")
-                    pr_title = self.get_trimmed_pr_title(event['payload']['issue']['title'])
-                    if author:
-                        feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> commented on <b>{author}'s</b> <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
-                    else:                        
-                        feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> commented on an issue on <b>{repo}</b> <span style='font-size: 8px;'>({pr_title})</span>")
-                elif event_type == 'PullRequestReviewEvent':
-                    pr = event['payload']['pull_request']['url'].replace("api.", "").replace("/repos", "").replace("/pulls", "/pull")
-                    pr_title = self.get_trimmed_pr_title(event['payload']['pull_request']['title'])
-                    if author:
-                        feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> reviewed <b>{author}'s</b> <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
-                    else:
-                        feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> reviewed this <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
+                    feed_strings.append(f"{event_time}{repo_name} <b>{user}</b> reviewed this <a href='{pr}'>PR</a> <span style='font-size: 8px;'>({pr_title})</span>")
         feed_progress.progress(100)
         repo_progress_md.markdown("")
         st.markdown(f"{len(feed_strings)} events in the last {last_n_hours} hours")
@@ -260,7 +387,7 @@ class GithubAPI:
         pr_api_url = pr_url.replace("github.com", "api.github.com/repos").replace("/pull/", "/pulls/")
         diff_url = f"{pr_api_url}/files"
         
-        response = requests.get(diff_url, headers=self.headers)
+        response = self.session.get(diff_url, timeout=10)
         
         if response.status_code != 200:
             raise Exception(f"Failed to fetch PR diff: {response.status_code} {response.text}")
@@ -289,11 +416,11 @@ class GithubAPI:
 
     def get_all_users_for_repo(self, repo_name: str) -> list[str]:
         repo_url = f"{self.root_url}/repos/{self.user}/{repo_name}/contributors"
-        response = requests.get(repo_url, headers=self.headers)
-        return [user['login'] for user in response.json()]
+        _, users = self._get_json(repo_url)
+        return [user['login'] for user in users]
 
     def get_repos(self) -> list[str]:
-        response = requests.get(f"{self.root_url}/user/repos", headers=self.headers)
+        response = self.session.get(f"{self.root_url}/user/repos", timeout=10)
         return [repo['name'] for repo in response.json()]
 
     def get_prs_for_repo(self, repo_name: str, start: datetime, end: datetime, author: str = None) -> list[str]:
@@ -308,7 +435,7 @@ class GithubAPI:
         print(search_query)
         prs_url = f"{self.root_url}/search/issues?per_page=100&q={search_query}"
         
-        response = requests.get(prs_url, headers=self.headers)
+        response = self.session.get(prs_url, timeout=10)
         response_json = response.json()
 
         if "errors" in response_json or ('items' in response_json and len(response_json['items']) == 0):
@@ -0,0 +1,158 @@
+import asyncio
+import importlib.util
+import os
+from typing import List, Dict, Any, AsyncIterator, Tuple
+from urllib.parse import urlparse
+import httpx
+from tenacity import AsyncRetrying
+from shortcut_models import Story, SearchIncomplete, check_search_page, next_search_params
+from shortcut_scheduler import RateLimitScheduler, Priority, RETRY_POLICY
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec('h2') is not None
+
+
+class AsyncShortcutGateway:
+    """
+    asyncio counterpart of ShortcutGateway's read methods on a pooled
+    httpx.AsyncClient. Connections are kept alive and shared, at most
+    `per_host_limit` requests are in flight per host, and HTTP/2 is used
+    when asked for and the `h2` package is installed.
+
+        async with AsyncShortcutGateway() as gateway:
+            stories = await gateway.fetch_stories_for_epics([21023, 21024])
+    """
+    def __init__(self, token: str = None, base_url: str = 'https://api.app.shortcut.com/api',
+                 max_connections: int = 20, per_host_limit: int = 8, http2: bool = False, timeout: float = 10,
+                 scheduler: RateLimitScheduler = None):
+        self._base_url = base_url
+        self._token = token or os.getenv('SHORTCUT_API_TOKEN')
+        if not self._token:
+            raise ValueError("SHORTCUT_API_TOKEN environment variable is not set. Please check your .env file.")
+        if http2 and not _http2_available():
+            print("HTTP/2 requested but the h2 package is not installed; falling back to HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            headers={"Shortcut-Token": self._token, "Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            http2=http2,
+            timeout=timeout,
+        )
+        self.per_host_limit = per_host_limit
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # share the sync gateway's scheduler so both paths draw from one bucket
+        self.scheduler = scheduler or RateLimitScheduler()
+
+    async def __aenter__(self) -> "AsyncShortcutGateway":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def make_api_call(self, url: str, additional_params: Dict[str, Any] = None, priority: Priority = None) -> Any:
+        # the scheduler's default priority is per thread, so it is read here rather than in the worker thread
+        if priority is None:
+            priority = self.scheduler.default_priority
+        try:
+            async for attempt in AsyncRetrying(**RETRY_POLICY):
+                with attempt:
+                    # the host slot is held per attempt, not across the backoff sleeps between them
+                    async with self._semaphore_for(url):
+                        # acquire blocks, so wait for the token off the event loop
+                        await asyncio.to_thread(self.scheduler.acquire, priority)
+                        response = await self._client.get(url, params=additional_params)
+                        self.scheduler.observe(response.status_code, response.headers)
+                        response.raise_for_status()
+                        return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: a body that isn't JSON, which the sync path sees as a RequestException
+            print(f"API call failed: {e}")
+            return None
+
+    async def get_members(self) -> List[Dict[str, Any]]:
+        return await self.make_api_call(f"{self._base_url}/v3/members") or []
+
+    async def get_workflows(self) -> List[Dict[str, Any]]:
+        return await self.make_api_call(f"{self._base_url}/v3/workflows") or []
+
+    async def get_epic_from_id(self, epic_id: int) -> Dict[str, Any]:
+        return await self.make_api_call(f"{self._base_url}/v3/epics/{epic_id}")
+
+    async def get_objective_from_id(self, objective_id: int) -> Dict[str, Any]:
+        return await self.make_api_call(f"{self._base_url}/v3/objectives/{objective_id}")
+
+    async def get_epics_for_objective(self, objective_id: int, exclude_completed: bool = False) -> List[Dict[str, Any]]:
+        epics = await self.make_api_call(f"{self._base_url}/v3/objectives/{objective_id}/epics") or []
+        if exclude_completed:
+            epics = [epic for epic in epics if not epic['completed']]
+        return epics
+
+    async def get_stories_for_epic(self, epic_id: int, priority: Priority = None) -> List[Story]:
+        stories = await self.make_api_call(f"{self._base_url}/v3/epics/{epic_id}/stories", priority=priority)
+        if stories is None:
+            return None
+        return [Story.from_json(story) for story in stories]
+
+    async def get_stories_for_iteration(self, iteration_id: int) -> List[Story]:
+        stories = await self.make_api_call(f"{self._base_url}/v3/iterations/{iteration_id}/stories")
+        return [Story.from_json(story) for story in stories or []]
+
+    async def iter_search_pages(self, query, page_size: int = 25) -> AsyncIterator[List[Story]]:
+        """
+        ShortcutGateway.iter_search_pages on the event loop: yields each page's
+        stories, following the cursor-chained pages one after another, and
+        raises SearchIncomplete if a page fails or Shortcut caps the results.
+        """
+        url = f"{self._base_url}/v3/search/stories"
+        params = {'query': str(query), 'page_size': page_size, 'detail': 'full'}
+        returned = 0
+        while params is not None:
+            page = await self.make_api_call(url, params)
+            check_search_page(query, page, returned)
+            stories = [Story.from_json(story) for story in page.get('data', [])]
+            returned += len(stories)
+            yield stories
+            params = next_search_params(query, page, returned)
+
+    async def search_stories(self, query, page_size: int = 25) -> List[Story]:
+        # the whole result set, or None if it is incomplete, as ShortcutGateway.search_stories
+        try:
+            return [story async for page in self.iter_search_pages(query, page_size) for story in page]
+        except SearchIncomplete as e:
+            print(f"Story search incomplete, falling back: {e}")
+            return None
+
+    async def iter_stories_for_epics(self, epic_ids: List[int], priority: Priority = None) -> AsyncIterator[Tuple[int, List[Story]]]:
+        # (epic_id, stories) in completion order; stories is None if that epic's fetch failed
+        async def fetch(epic_id):
+            return epic_id, await self.get_stories_for_epic(epic_id, priority)
+
+        for next_done in asyncio.as_completed([fetch(epic_id) for epic_id in dict.fromkeys(epic_ids)]):
+            yield await next_done
+
+    async def fetch_stories_for_epics(self, epic_ids: List[int], on_progress=None) -> Dict[int, List[Story]]:
+        """
+        Fetches every epic's stories concurrently. `on_progress(done, total)`
+        runs on the event loop's thread as each epic completes. Epics whose
+        fetch failed are missing from the result.
+        """
+        results: Dict[int, List[Story]] = {}
+        total = len(dict.fromkeys(epic_ids))
+        done = 0
+        async for epic_id, stories in self.iter_stories_for_epics(epic_ids):
+            done += 1
+            if stories is not None:
+                results[epic_id] = stories
+            if on_progress:
+                on_progress(done, total)
+        return results
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List
+import pandas as pd
+from shortcut_standin import ShortcutStandIn, synthetic_workspace, load_workspace, MAIN_OBJECTIVES
+
+
+def _explain_epics(setup_gateway, start: datetime, end: datetime) -> Callable[[Any], Any]:
+    epics = [epic for objective_id in MAIN_OBJECTIVES for epic in setup_gateway.get_epics_for_objective(objective_id)]
+    return lambda gateway: gateway.explain_epics(epics, start, end, verbose=True, show_progress_bar=False)
+
+
+def _completion_rate_for_epic(setup_gateway, start: datetime, end: datetime) -> Callable[[Any], Any]:
+    epic = setup_gateway.get_epics_for_objective(MAIN_OBJECTIVES[0])[0]
+    return lambda gateway: gateway.get_completion_rate_for_epic(start, end, epic)
+
+
+def _stories_between_dates(setup_gateway, start: datetime, end: datetime) -> Callable[[Any], Any]:
+    return lambda gateway: gateway.get_stories_between_dates(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+
+
+# entry point -> setup(setup_gateway, start, end) returning the call to measure,
+# given the measured gateway; setup requests (e.g. listing the epics to explain)
+# go through a separate gateway so they neither count nor warm its caches
+ENTRY_POINTS: Dict[str, Callable] = {
+    'explain_epics': _explain_epics,
+    'get_completion_rate_for_epic': _completion_rate_for_epic,
+    'get_stories_between_dates': _stories_between_dates,
+}
+
+
+def measure(stand_in: ShortcutStandIn, call: Callable[[], Any], track_memory: bool = True, scheduler=None) -> Dict[str, float]:
+    # wall time, requests served by the stand-in, time queued for rate-limit tokens
+    # (summed over requests) and peak traced Python allocations of one call
+    stand_in.reset_counts()
+    queued_before = scheduler.queued_seconds if scheduler is not None else None
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        call()
+        wall = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return {
+        'Wall (s)': round(wall, 3),
+        'Requests': stand_in.request_count,
+        'Queued (s)': round(scheduler.queued_seconds - queued_before, 3) if scheduler is not None else None,
+        'Peak memory (MiB)': round(peak / 2 ** 20, 2) if peak is not None else None,
+        'By route': stand_in.request_counts(),
+    }
+
+
+def run_benchmarks(stand_in: ShortcutStandIn, entry_points: List[str] = None, days: int = 30, repeat: int = 2,
+                   fetch_mode: str = None, track_memory: bool = True) -> pd.DataFrame:
+    """
+    Runs each entry point against `stand_in` on a fresh ShortcutGateway
+    (the cold run: setup happens on a separate gateway, so nothing is
+    cached yet), then `repeat - 1` more times on the same gateway after
+    invalidate_story_snapshot(), as the app does on each click. The rate
+    limiter is refilled before every run, so a warm run doesn't wait out
+    the tokens the cold one spent. One row per run with wall time, request
+    count, time queued for tokens and peak memory.
+    """
+    # deferred so SHORTCUT_* settings made by the caller are picked up
+    from shortcut_utils import ShortcutGateway
+
+    def new_gateway():
+        gateway = ShortcutGateway()
+        gateway._base_url = stand_in.base_url
+        if fetch_mode:
+            gateway.fetch_mode = fetch_mode
+        return gateway
+
+    end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    rows = []
+    for name in entry_points or list(ENTRY_POINTS):
+        setup_gateway = new_gateway()
+        try:
+            call = ENTRY_POINTS[name](setup_gateway, start, end)
+        finally:
+            setup_gateway.close()
+        gateway = new_gateway()
+        try:
+            for run in range(repeat):
+                if run:
+                    gateway.invalidate_story_snapshot()
+                gateway.scheduler.refill()
+                result = measure(stand_in, lambda: call(gateway), track_memory, gateway.scheduler)
+                rows.append({'Entry point': name, 'Run': 'cold' if run == 0 else f"warm {run}", **result})
+        finally:
+            gateway.close()
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    # Offline timings for the Shortcut entry points, e.g.
+    #   python shortcut_benchmark.py --latency 0.08 --jitter 0.04
+    #   python shortcut_benchmark.py --workspace recording.json --fetch-mode async
+    parser = argparse.ArgumentParser(description="Benchmark ShortcutGateway entry points against a local Shortcut stand-in")
+    parser.add_argument('--workspace', help="recorded workspace JSON (see shortcut_standin.record_workspace); synthetic if omitted")
+    parser.add_argument('--epics', type=int, default=9, help="synthetic epics")
+    parser.add_argument('--stories-per-epic', type=int, default=100, help="synthetic stories per epic")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument('--days', type=int, default=30, help="date range ending today")
+    parser.add_argument('--repeat', type=int, default=2, help="runs per entry point; all but the first are warm")
+    parser.add_argument('--entry-point', action='append', choices=list(ENTRY_POINTS), help="default: all")
+    parser.add_argument('--fetch-mode', choices=['threads', 'async'])
+    parser.add_argument('--no-server-search', action='store_true', help="pull whole epics instead of /v3/search/stories")
+    parser.add_argument('--rate-limit', type=int, help="requests per minute for the gateway's scheduler")
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc, which slows the measured calls")
+    parser.add_argument('--json', help="also write the results here, e.g. to compare runs")
+    args = parser.parse_args()
+
+    os.environ.setdefault('SHORTCUT_API_TOKEN', 'stand-in')
+    if args.no_server_search:
+        os.environ['SHORTCUT_SERVER_SEARCH'] = '0'
+    if args.rate_limit:
+        os.environ['SHORTCUT_RATE_LIMIT_PER_MINUTE'] = str(args.rate_limit)
+
+    if args.workspace:
+        workspace = load_workspace(args.workspace)
+    else:
+        workspace = synthetic_workspace(epics=args.epics, stories_per_epic=args.stories_per_epic)
+    stand_in = ShortcutStandIn(workspace, latency=args.latency, jitter=args.jitter)
+    stand_in.start()
+    try:
+        results = run_benchmarks(stand_in, args.entry_point, args.days, args.repeat, args.fetch_mode, not args.no_memory)
+    finally:
+        stand_in.stop()
+
+    print(results.drop(columns=['By route']).to_string(index=False))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results.to_dict(orient='records'), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+import pandas as pd
+from shortcut_models import Story
+from shortcut_metrics import _as_date
+
+CUSTOMER_LABEL_PREFIX = 'customer/'
+# `customer/acme` is reported as `acme` in the c1/c2 label maps
+_CUSTOMER_PREFIX = re.compile(r'^customer/')
+
+# label slot holding every story once; per-label slots fan a story out per label
+ALL_LABELS = None
+
+
+class Cell:
+    """
+    Counts for one (date, epic, owner, label) slot. The filed-side counts
+    are keyed by the day the stories were created, `completed` by the day
+    they were completed, and `completed_on` breaks the filed stories down by
+    completion day so period queries can split in-range from earlier work.
+    """
+    __slots__ = ('filed', 'filed_completed', 'days_to_complete', 'code_red', 'completed', 'completed_on')
+
+    def __init__(self):
+        self.filed = 0
+        self.filed_completed = 0
+        self.days_to_complete = 0
+        self.code_red = 0
+        self.completed = 0
+        self.completed_on: Dict[date, int] = defaultdict(int)
+
+    def is_empty(self) -> bool:
+        return self.filed == 0 and self.completed == 0
+
+
+class MetricsCube:
+    """
+    Materialized daily story counts keyed by (date, epic, primary owner,
+    label), kept current by `apply(old, new)` as stories change (see
+    StoryIndex.add_listener). Date-range questions are sums over the days in
+    the range instead of a rescan of the stories. Open ages depend on "now"
+    and are derived at query time from the open counts per filing day.
+    Storage is keyed by epic first, so a query only touches its epics.
+    """
+    def __init__(self, code_red_days_after: int = 10):
+        self.code_red_days_after = code_red_days_after
+        # epic_id -> (owner_id, label) -> day -> Cell
+        self._series: Dict[int, Dict[Tuple[str, str], Dict[date, Cell]]] = defaultdict(lambda: defaultdict(dict))
+        self._lock = threading.Lock()
+
+    def _slots(self, story: Story) -> List[Tuple[str, str]]:
+        slots = [(story.owner_id, ALL_LABELS)]
+        slots.extend((story.owner_id, label) for label in story.labels)
+        return slots
+
+    def _cell(self, series, slot, day: date) -> Cell:
+        cells = series[slot]
+        if day not in cells:
+            cells[day] = Cell()
+        return cells[day]
+
+    def _add(self, story: Story, sign: int) -> None:
+        if story.created_at is None:
+            return
+        created_day = story.created_at.date()
+        completed_day = story.completed_at.date() if story.completed and story.completed_at else None
+        days_to_complete = (completed_day - created_day).days if completed_day else None
+        series = self._series[story.epic_id]
+        for slot in self._slots(story):
+            cell = self._cell(series, slot, created_day)
+            cell.filed += sign
+            if story.completed:
+                cell.filed_completed += sign
+            if days_to_complete is not None:
+                cell.days_to_complete += sign * days_to_complete
+                if days_to_complete > self.code_red_days_after:
+                    cell.code_red += sign
+                cell.completed_on[completed_day] += sign
+                if not cell.completed_on[completed_day]:
+                    del cell.completed_on[completed_day]
+            if completed_day is not None:
+                self._cell(series, slot, completed_day).completed += sign
+            for day in {created_day, completed_day} - {None}:
+                if series[slot][day].is_empty():
+                    del series[slot][day]
+            if not series[slot]:
+                del series[slot]
+        if not series:
+            del self._series[story.epic_id]
+
+    def apply(self, old: Story, new: Story) -> None:
+        # replace one story's contribution; either side may be None (insert / delete)
+        with self._lock:
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+
+    def _cells(self, epic_ids: Iterable[int], start, end, owner_id: str = None, by_label: bool = False) -> Iterable[Tuple[str, date, Cell]]:
+        # (label, day, cell) for the epics (every epic if None) with start <= day <= end (inclusive
+        # days); only the all-stories slot unless `by_label`, in which case only the per-label slots
+        if epic_ids is None:
+            epic_series = list(self._series.values())
+        else:
+            epic_series = [self._series[epic_id] for epic_id in set(epic_ids) if epic_id in self._series]
+        start_day, end_day = _as_date(start), _as_date(end)
+        for (slot_owner, label), cells in (item for series in epic_series for item in series.items()):
+            if (label is ALL_LABELS) == by_label:
+                continue
+            if owner_id is not None and slot_owner != owner_id:
+                continue
+            if len(cells) < (end_day - start_day).days:
+                days = [day for day in cells if start_day <= day <= end_day]
+            else:
+                days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+            for day in days:
+                cell = cells.get(day)
+                if cell is not None:
+                    yield label, day, cell
+
+    def epic_summary(self, epic_ids: Iterable[int], start, end, owner_id: str = None, now: datetime = None) -> Dict[str, Any]:
+        """
+        The epic_metrics totals for stories filed on days start..end
+        (inclusive): total, completed, not_completed, code_red,
+        days_for_completion, days_filed_since_cumulative, c1_map and c2_map.
+        """
+        today = _as_date(now or datetime.now())
+        summary = {
+            "total": 0, "completed": 0, "not_completed": 0, "code_red": 0,
+            "days_for_completion": 0, "days_filed_since_cumulative": 0,
+            "c1_map": defaultdict(int), "c2_map": defaultdict(int),
+        }
+        with self._lock:
+            for _, day, cell in self._cells(epic_ids, start, end, owner_id):
+                summary["total"] += cell.filed
+                summary["completed"] += cell.filed_completed
+                summary["not_completed"] += cell.filed - cell.filed_completed
+                summary["code_red"] += cell.code_red
+                summary["days_for_completion"] += cell.days_to_complete
+                summary["days_filed_since_cumulative"] += (cell.filed - cell.filed_completed) * (today - day).days
+            for label, _, cell in self._cells(epic_ids, start, end, owner_id, by_label=True):
+                label = _CUSTOMER_PREFIX.sub('', label)
+                if cell.filed:
+                    summary["c1_map"][label] += cell.filed
+                if cell.filed_completed:
+                    summary["c2_map"][label] += cell.filed_completed
+        return summary
+
+    def label_summary(self, start, end, prefix: str = CUSTOMER_LABEL_PREFIX, epic_ids: Iterable[int] = None,
+                      now: datetime = None) -> Dict[str, Dict[str, int]]:
+        """
+        Per-label totals for stories filed on days start..end across every
+        epic (or just `epic_ids`), for labels starting with `prefix`, keyed by
+        the label without it: filed, completed, open, open_age (summed days
+        since filing of the open ones), days_to_complete and code_red.
+        """
+        today = _as_date(now or datetime.now())
+        totals: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(
+            ('filed', 'completed', 'open', 'open_age', 'days_to_complete', 'code_red'), 0
+        ))
+        with self._lock:
+            for label, day, cell in self._cells(epic_ids, start, end, by_label=True):
+                if not label.startswith(prefix):
+                    continue
+                row = totals[label[len(prefix):]]
+                row['filed'] += cell.filed
+                row['completed'] += cell.filed_completed
+                row['open'] += cell.filed - cell.filed_completed
+                row['open_age'] += (cell.filed - cell.filed_completed) * (today - day).days
+                row['days_to_complete'] += cell.days_to_complete
+                row['code_red'] += cell.code_red
+        return dict(totals)
+
+    def period_activity(self, epic_ids: Iterable[int], start, end, owner_id: str = None) -> Tuple[int, int, int]:
+        # (filed, completed and filed in range, completed in range but filed earlier) for days start..end
+        start_day, end_day = _as_date(start), _as_date(end)
+        filed = completed = in_range_completed = 0
+        with self._lock:
+            for _, _, cell in self._cells(epic_ids, start_day, end_day, owner_id):
+                filed += cell.filed
+                completed += cell.completed
+                in_range_completed += sum(count for day, count in cell.completed_on.items() if day <= end_day)
+        return filed, in_range_completed, completed - in_range_completed
+
+    def daily_filed_completed(self, epic_ids: Iterable[int], start, end, owner_id: str = None) -> pd.DataFrame:
+        # per-day filed and completed counts for days in [start, end), as the melted
+        # Date/Category/Count frame the completion charts use
+        start_day, end_day = _as_date(start), _as_date(end)
+        filed: Dict[date, int] = defaultdict(int)
+        completed: Dict[date, int] = defaultdict(int)
+        with self._lock:
+            for _, day, cell in self._cells(epic_ids, start_day, end_day - timedelta(days=1), owner_id):
+                filed[day] += cell.filed
+                completed[day] += cell.completed
+
+        days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days)]
+        df = pd.DataFrame({
+            "Date": pd.to_datetime(days),
+            "Filed": [filed.get(day, 0) for day in days],
+            "Completed": [completed.get(day, 0) for day in days],
+        })
+        return df.melt(id_vars=["Date"], var_name="Category", value_name="Count")
+
+    def trailing_backlog_rate(self, epic_ids: Iterable[int], start, end, window_days: int = 14,
+                              owner_id: str = None, now: datetime = None) -> list:
+        """
+        For each day in [start, end), the average age as of `now` of the open
+        stories filed in the `window_days` days before it, in days per open
+        story.
+
+        The series used to plot open count / cumulative age (stories per day),
+        the reciprocal of this value, so charts from before and after the
+        change are not comparable.
+        """
+        today = _as_date(now or datetime.now())
+        first_day = _as_date(start) - timedelta(days=window_days)
+        open_count: Dict[date, int] = defaultdict(int)
+        with self._lock:
+            for _, day, cell in self._cells(epic_ids, first_day, _as_date(end), owner_id):
+                open_count[day] += cell.filed - cell.filed_completed
+
+        tuples = []
+        for i in range((end - start).days):
+            current_date = start + timedelta(days=i)
+            current_day = _as_date(current_date)
+            window = [current_day - timedelta(days=offset) for offset in range(1, window_days + 1)]
+            count = sum(open_count.get(day, 0) for day in window)
+            age = sum(open_count.get(day, 0) * (today - day).days for day in window)
+            tuples.append((current_date, age / count if count > 0 else 0))
+        return tuples
@@ -0,0 +1,95 @@
+from datetime import datetime, date
+from typing import List, Dict, Any
+from collections import defaultdict
+import pandas as pd
+from shortcut_models import Story
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def story_frame(stories: List[Story]) -> pd.DataFrame:
+    """
+    Columnar view of a story list: `datetime64` created/completed columns,
+    a boolean `completed` column and the label names as a list per row.
+    Story timestamps are already datetimes, so nothing is re-parsed here.
+    """
+    return pd.DataFrame({
+        "id": [story.id for story in stories],
+        "name": [story.name for story in stories],
+        "story_type": [story.story_type for story in stories],
+        "created_at": pd.to_datetime([story.created_at for story in stories]).astype('datetime64[ns]'),
+        "completed_at": pd.to_datetime([story.completed_at for story in stories]).astype('datetime64[ns]'),
+        "completed": pd.Series([story.completed for story in stories], dtype=bool),
+        "labels": [list(story.labels) for story in stories],
+    })
+
+
+def explode_labels(frame: pd.DataFrame) -> pd.DataFrame:
+    # one row per (story, label); `customer/acme` is reported as `acme`
+    exploded = frame[["id", "completed", "labels"]].explode("labels").dropna(subset=["labels"])
+    exploded = exploded.rename(columns={"labels": "label"})
+    exploded["label"] = exploded["label"].str.replace(r'^customer/', '', regex=True)
+    return exploded
+
+
+def _label_counts(exploded: pd.DataFrame) -> Dict[str, int]:
+    counts = defaultdict(int)
+    for label, count in exploded["label"].value_counts(sort=False).items():
+        counts[label] = int(count)
+    return counts
+
+
+def epic_metrics(frame: pd.DataFrame, start_date, end_date, code_red_days_after: int = 10, now: datetime = None) -> Dict[str, Any]:
+    """
+    Vectorized explain_epic metrics over the stories created between
+    midnight of `start_date` and midnight of `end_date` (both inclusive).
+    Day counts are whole calendar days between the dates, as before.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    start_ts = pd.Timestamp(_as_date(start_date))
+    end_ts = pd.Timestamp(_as_date(end_date))
+    in_range = frame[(frame["created_at"] >= start_ts) & (frame["created_at"] <= end_ts)]
+
+    created_day = in_range["created_at"].dt.normalize()
+    days_to_complete = (in_range["completed_at"].dt.normalize() - created_day).dt.days
+    days_to_complete = days_to_complete.where(in_range["completed"])
+    days_filed_since = (now - created_day).dt.days.where(~in_range["completed"])
+
+    exploded = explode_labels(in_range)
+    return {
+        "stories": in_range,
+        "days_to_complete": days_to_complete,
+        "days_filed_since": days_filed_since,
+        "total": len(in_range),
+        "completed": int(in_range["completed"].sum()),
+        "not_completed": int((~in_range["completed"]).sum()),
+        "code_red": int((days_to_complete > code_red_days_after).sum()),
+        "days_for_completion": int(days_to_complete.sum()),
+        "days_filed_since_cumulative": int(days_filed_since.sum()),
+        "c1_map": _label_counts(exploded),
+        "c2_map": _label_counts(exploded[exploded["completed"]]),
+    }
+
+
+def period_activity(frame: pd.DataFrame, start_date, end_date) -> tuple:
+    """
+    Filed and completed counts for the [start_date, end_date] day range:
+    (filed, completed and filed in range, completed in range but filed
+    earlier, titles of the completed stories in story order).
+    """
+    start_ts = pd.Timestamp(_as_date(start_date))
+    end_ts = pd.Timestamp(_as_date(end_date))
+    created_day = frame["created_at"].dt.normalize()
+    completed_day = frame["completed_at"].dt.normalize()
+
+    filed_in_range = (created_day >= start_ts) & (created_day <= end_ts)
+    completed_in_range = frame["completed"] & (completed_day >= start_ts) & (completed_day <= end_ts)
+    in_range_completed = completed_in_range & filed_in_range
+    out_range_completed = completed_in_range & (created_day < start_ts)
+
+    titles = frame.loc[in_range_completed | out_range_completed, "name"].tolist()
+    return int(filed_in_range.sum()), int(in_range_completed.sum()), int(out_range_completed.sum()), titles
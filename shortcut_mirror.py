@@ -0,0 +1,258 @@
+import json
+import os
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any
+from peewee import (
+    SqliteDatabase, Model, IntegerField, CharField, BooleanField, TextField, CompositeKey, chunked
+)
+from shortcut_utils import StoryQuery
+from shortcut_models import Story, SHORTCUT_TIMESTAMP_FORMAT
+from shortcut_scheduler import Priority
+
+# Entity lists small enough to re-pull in one call on every sync
+ENTITY_TYPES = ['members', 'workflows', 'objectives', 'epics', 'iterations']
+
+db = SqliteDatabase(None)
+
+
+class BaseModel(Model):
+    class Meta:
+        database = db
+
+
+class StoryRecord(BaseModel):
+    id = IntegerField(primary_key=True)
+    epic_id = IntegerField(null=True, index=True)
+    iteration_id = IntegerField(null=True, index=True)
+    created_at = CharField(index=True)
+    updated_at = CharField(index=True)
+    completed = BooleanField(default=False)
+    data = TextField()
+
+
+class EntityRecord(BaseModel):
+    entity_type = CharField()
+    entity_id = CharField()
+    updated_at = CharField(null=True)
+    data = TextField()
+
+    class Meta:
+        primary_key = CompositeKey('entity_type', 'entity_id')
+
+
+class SyncState(BaseModel):
+    key = CharField(primary_key=True)
+    value = CharField()
+
+
+class ShortcutMirror:
+    """
+    Local SQLite copy of the Shortcut workspace. `sync` re-pulls the small
+    entity lists and fetches only stories updated since the last sync. The
+    first sync, and one every `reconcile_interval` seconds after it, pulls
+    every epic's stories plus the stories outside any epic and drops rows
+    Shortcut no longer has, since deletions never show up as updates. Read
+    methods return the same JSON shapes as the live API so ShortcutGateway
+    can serve from either.
+    """
+    def __init__(self, gateway, path: str = None, reconcile_interval: float = None):
+        self._gateway = gateway
+        self.path = path or os.getenv('SHORTCUT_MIRROR_PATH', 'shortcut_mirror.db')
+        self.reconcile_interval = reconcile_interval or float(os.getenv('SHORTCUT_MIRROR_RECONCILE_HOURS', 24)) * 60 * 60
+        db.init(self.path, pragmas={'journal_mode': 'wal', 'synchronous': 'normal'})
+        db.create_tables([StoryRecord, EntityRecord, SyncState])
+        self._sync_lock = threading.Lock()
+        self._sync_thread = None
+        self._ready = False
+
+    # --- sync ---
+
+    def _get_state(self, key: str) -> str:
+        row = SyncState.get_or_none(SyncState.key == key)
+        return row.value if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        SyncState.replace(key=key, value=value).execute()
+
+    def _sync_entities(self, entity_type: str) -> int:
+        entities = self._gateway.make_api_call(f"{self._gateway._base_url}/v3/{entity_type}")
+        if entities is None:
+            return 0
+        stored = {
+            row.entity_id: row.updated_at
+            for row in EntityRecord.select(EntityRecord.entity_id, EntityRecord.updated_at)
+                                   .where(EntityRecord.entity_type == entity_type)
+        }
+        changed = [
+            entity for entity in entities
+            if str(entity['id']) not in stored or stored[str(entity['id'])] != entity.get('updated_at')
+        ]
+        live_ids = {str(entity['id']) for entity in entities}
+        gone = [entity_id for entity_id in stored if entity_id not in live_ids]
+        with db.atomic():
+            for batch in chunked(changed, 200):
+                EntityRecord.replace_many([{
+                    'entity_type': entity_type,
+                    'entity_id': str(entity['id']),
+                    'updated_at': entity.get('updated_at'),
+                    'data': json.dumps(entity),
+                } for entity in batch]).execute()
+            if gone:
+                EntityRecord.delete().where(
+                    (EntityRecord.entity_type == entity_type) & (EntityRecord.entity_id.in_(gone))
+                ).execute()
+        return len(changed) + len(gone)
+
+    def upsert_stories(self, stories: List[Story]) -> None:
+        with db.atomic():
+            for batch in chunked(stories, 200):
+                rows = []
+                for story in batch:
+                    data = story.to_json()
+                    rows.append({
+                        'id': story.id,
+                        'epic_id': story.epic_id,
+                        'iteration_id': story.iteration_id,
+                        'created_at': data['created_at'],
+                        'updated_at': data['updated_at'] or data['created_at'],
+                        'completed': story.completed,
+                        'data': json.dumps(data),
+                    })
+                StoryRecord.replace_many(rows).execute()
+
+    def delete_story(self, story_id: int) -> None:
+        self.delete_stories([story_id])
+
+    def delete_stories(self, story_ids: List[int]) -> None:
+        with db.atomic():
+            for batch in chunked(story_ids, 200):
+                StoryRecord.delete().where(StoryRecord.id.in_(batch)).execute()
+
+    def _reconcile_stories(self, started_at: str) -> int:
+        # every epic's stories plus the epic-less ones; rows missing from both were deleted in Shortcut
+        epic_ids = [int(row.entity_id) for row in EntityRecord.select(EntityRecord.entity_id)
+                                                         .where(EntityRecord.entity_type == 'epics')]
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self._gateway.max_concurrency) as pool:
+            urls = [f"{self._gateway._base_url}/v3/epics/{epic_id}/stories" for epic_id in epic_ids]
+            fetch = partial(self._gateway.make_api_call, additional_params={}, priority=Priority.BACKGROUND)
+            for stories in pool.map(fetch, urls):
+                if stories is None:
+                    return None
+                stories = [Story.from_json(story) for story in stories]
+                self.upsert_stories(stories)
+                seen.update(story.id for story in stories)
+        epicless = self._gateway.search_epicless_stories()
+        if epicless is None:
+            return None
+        self.upsert_stories(epicless)
+        seen.update(story.id for story in epicless)
+        # rows written after the pass started (e.g. by a webhook) may not have been seen yet
+        gone = [
+            row.id for row in StoryRecord.select(StoryRecord.id).where(StoryRecord.updated_at < started_at)
+            if row.id not in seen
+        ]
+        self.delete_stories(gone)
+        # the index only refreshes from updates, so deletions are passed on (and through it to the cube)
+        for story_id in gone:
+            self._gateway.story_index.remove(story_id)
+        return len(seen) + len(gone)
+
+    def _reconcile_due(self, now: datetime) -> bool:
+        reconciled_at = self._get_state('stories_reconciled_at')
+        if reconciled_at is None:
+            return True
+        return (now - datetime.strptime(reconciled_at, SHORTCUT_TIMESTAMP_FORMAT)).total_seconds() > self.reconcile_interval
+
+    def _sync_stories(self) -> int:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        started_at = now.strftime(SHORTCUT_TIMESTAMP_FORMAT)
+        cursor = self._get_state('stories_updated_at')
+        if cursor is None or self._reconcile_due(now):
+            changed = self._reconcile_stories(started_at)
+            if changed is None:
+                return 0
+            self._set_state('stories_updated_at', started_at)
+            self._set_state('stories_reconciled_at', started_at)
+            return changed
+
+        # back off a day: the search index works in whole days and lags writes
+        since = datetime.strptime(cursor, SHORTCUT_TIMESTAMP_FORMAT) - timedelta(days=1)
+        stories = self._gateway.search_stories_by_range(StoryQuery.updated_between, since, now + timedelta(days=1))
+        if stories is None:
+            return 0
+        self.upsert_stories(stories)
+        self._set_state('stories_updated_at', started_at)
+        return len(stories)
+
+    def sync(self) -> Dict[str, int]:
+        with self._sync_lock, self._gateway.scheduler.background():
+            changes = {entity_type: self._sync_entities(entity_type) for entity_type in ENTITY_TYPES}
+            changes['stories'] = self._sync_stories()
+            self._set_state('last_sync', datetime.now(timezone.utc).strftime(SHORTCUT_TIMESTAMP_FORMAT))
+            return changes
+
+    def start_background_sync(self, interval: float = 5 * 60) -> None:
+        if self._sync_thread is not None:
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"Shortcut mirror sync failed: {e}")
+                time.sleep(interval)
+
+        self._sync_thread = threading.Thread(target=loop, name="shortcut-mirror-sync", daemon=True)
+        self._sync_thread.start()
+
+    def is_ready(self) -> bool:
+        # sticky once true; checked on every gateway read
+        if not self._ready:
+            self._ready = self._get_state('stories_updated_at') is not None
+        return self._ready
+
+    # --- reads ---
+
+    def entities(self, entity_type: str) -> List[Dict[str, Any]]:
+        query = EntityRecord.select(EntityRecord.data).where(EntityRecord.entity_type == entity_type)
+        return [json.loads(row.data) for row in query]
+
+    def entity(self, entity_type: str, entity_id) -> Dict[str, Any]:
+        row = EntityRecord.get_or_none(
+            (EntityRecord.entity_type == entity_type) & (EntityRecord.entity_id == str(entity_id))
+        )
+        return json.loads(row.data) if row else None
+
+    def epics_for_objective(self, objective_id: int) -> List[Dict[str, Any]]:
+        return [
+            epic for epic in self.entities('epics')
+            if epic.get('milestone_id') == objective_id or objective_id in epic.get('objective_ids', [])
+        ]
+
+    def _stories(self, where) -> List[Story]:
+        return [Story.from_json(json.loads(row.data)) for row in StoryRecord.select(StoryRecord.data).where(where)]
+
+    def stories_for_epic(self, epic_id: int) -> List[Story]:
+        return self._stories(StoryRecord.epic_id == epic_id)
+
+    def stories_for_iteration(self, iteration_id: int) -> List[Story]:
+        return self._stories(StoryRecord.iteration_id == iteration_id)
+
+    def all_stories(self) -> List[Story]:
+        return [Story.from_json(json.loads(row.data)) for row in StoryRecord.select(StoryRecord.data)]
+
+    def stories_updated_since(self, since: datetime) -> List[Story]:
+        return self._stories(StoryRecord.updated_at >= since.strftime('%Y-%m-%dT%H:%M:%SZ'))
+
+
+if __name__ == "__main__":
+    # One-off or cron-driven sync: python shortcut_mirror.py
+    from shortcut_utils import ShortcutGateway
+    mirror = ShortcutMirror(ShortcutGateway())
+    print(mirror.sync())
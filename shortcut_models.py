@@ -0,0 +1,158 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, Tuple, NamedTuple
+from urllib.parse import urlparse, parse_qs
+
+SHORTCUT_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# owner ids, label names and workflow state ids repeat across thousands of
+# stories; every Story shares one object per distinct value. Each vocabulary
+# (story types, member ids, labels, ...) has its own table, and once one holds
+# this many values new ones are used as-is, so a long-lived process can't grow them without bound.
+MAX_INTERNED_PER_VOCABULARY = 4096
+_vocabularies: Dict[str, Dict[Any, Any]] = defaultdict(dict)
+
+
+def _intern(vocabulary: str, value):
+    if value is None:
+        return None
+    values = _vocabularies[vocabulary]
+    interned = values.get(value)
+    if interned is not None:
+        return interned
+    if len(values) >= MAX_INTERNED_PER_VOCABULARY:
+        return value
+    return values.setdefault(value, value)
+
+
+# Shortcut stops paging a search after this many results, whatever its `total`
+SEARCH_RESULT_LIMIT = 1000
+
+
+class SearchIncomplete(Exception):
+    """
+    A story search that did not return its whole result set: a page failed,
+    or (`truncated`) Shortcut capped the results below `total`.
+    """
+    def __init__(self, message: str, truncated: bool = False):
+        super().__init__(message)
+        self.truncated = truncated
+
+
+def check_search_page(query, page: Dict[str, Any], returned: int) -> None:
+    # shared by the sync and async gateways: a failed page, or more matches than Shortcut pages through
+    if page is None:
+        raise SearchIncomplete(f"search '{query}' failed after {returned} stories")
+    total = page.get('total')
+    if total is not None and total > SEARCH_RESULT_LIMIT:
+        raise SearchIncomplete(f"search '{query}' matched {total} stories, over the {SEARCH_RESULT_LIMIT} Shortcut returns", truncated=True)
+
+
+def next_search_params(query, page: Dict[str, Any], returned: int) -> Dict[str, str]:
+    # params for the page after `page` (counted in `returned`), or None once the result set is exhausted
+    next_page = page.get('next')
+    if next_page:
+        return {key: values[0] for key, values in parse_qs(urlparse(next_page).query).items()}
+    total = page.get('total')
+    if total is not None and returned < total:
+        raise SearchIncomplete(f"search '{query}' returned {returned} of {total} stories", truncated=True)
+    return None
+
+
+def parse_timestamp(value: str) -> datetime:
+    if not value:
+        return None
+    return datetime.strptime(value, SHORTCUT_TIMESTAMP_FORMAT)
+
+
+class Story:
+    """
+    Compact, pre-parsed Shortcut story holding only the fields the dashboard
+    reads. Built once from the API JSON by `from_json`; timestamps are
+    datetimes and repeated ids/labels are interned.
+    """
+    __slots__ = (
+        'id', 'name', 'story_type', 'app_url', 'created_at', 'updated_at', 'completed',
+        'completed_at', 'epic_id', 'iteration_id', 'workflow_state_id', 'requested_by_id',
+        'owner_ids', 'labels',
+    )
+
+    def __init__(self, id: int, name: str, story_type: str = None, app_url: str = None,
+                 created_at: datetime = None, updated_at: datetime = None, completed: bool = False,
+                 completed_at: datetime = None, epic_id: int = None, iteration_id: int = None,
+                 workflow_state_id: int = None, requested_by_id: str = None,
+                 owner_ids: Tuple[str, ...] = (), labels: Tuple[str, ...] = ()):
+        self.id = id
+        self.name = name
+        self.story_type = story_type
+        self.app_url = app_url
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.completed = completed
+        self.completed_at = completed_at
+        self.epic_id = epic_id
+        self.iteration_id = iteration_id
+        self.workflow_state_id = workflow_state_id
+        self.requested_by_id = requested_by_id
+        self.owner_ids = owner_ids
+        self.labels = labels
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Story":
+        return cls(
+            id=data['id'],
+            name=data.get('name', ''),
+            story_type=_intern('story_type', data.get('story_type')),
+            app_url=data.get('app_url'),
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at')),
+            completed=bool(data.get('completed')),
+            completed_at=parse_timestamp(data.get('completed_at')),
+            epic_id=_intern('epic_id', data.get('epic_id')),
+            iteration_id=_intern('iteration_id', data.get('iteration_id')),
+            workflow_state_id=_intern('workflow_state_id', data.get('workflow_state_id')),
+            requested_by_id=_intern('member_id', data.get('requested_by_id')),
+            owner_ids=tuple(_intern('member_id', owner_id) for owner_id in data.get('owner_ids', [])),
+            labels=tuple(_intern('label', label['name']) for label in data.get('labels', [])),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        # API-shaped dict of the retained fields, e.g. for the SQLite mirror
+        def fmt(value: datetime) -> str:
+            return value.strftime(SHORTCUT_TIMESTAMP_FORMAT) if value else None
+
+        return {
+            'id': self.id,
+            'name': self.name,
+            'story_type': self.story_type,
+            'app_url': self.app_url,
+            'created_at': fmt(self.created_at),
+            'updated_at': fmt(self.updated_at),
+            'completed': self.completed,
+            'completed_at': fmt(self.completed_at),
+            'epic_id': self.epic_id,
+            'iteration_id': self.iteration_id,
+            'workflow_state_id': self.workflow_state_id,
+            'requested_by_id': self.requested_by_id,
+            'owner_ids': list(self.owner_ids),
+            'labels': [{'name': label} for label in self.labels],
+        }
+
+    @property
+    def owner_id(self) -> str:
+        # primary owner, or None if unassigned
+        return self.owner_ids[0] if self.owner_ids else None
+
+    def __repr__(self) -> str:
+        return f"Story(id={self.id}, name={self.name!r})"
+
+
+class ResolvedStory(NamedTuple):
+    """A story joined with the display names of its owner, requester, state, epic and objective."""
+    story: Story
+    owner: str
+    requester: str
+    state: str
+    epic_name: str
+    objective_name: str
+    workstream: str
@@ -0,0 +1,159 @@
+import json
+import os
+from datetime import datetime
+from typing import List, Dict, Any
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+from shortcut_models import Story, parse_timestamp
+
+DATASETS = ['stories', 'epics', 'members']
+PARTITION_COLUMN = 'created_month'
+
+STORY_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('name', pa.string()),
+    ('story_type', pa.string()),
+    ('app_url', pa.string()),
+    ('created_at', pa.timestamp('s')),
+    ('updated_at', pa.timestamp('s')),
+    ('completed', pa.bool_()),
+    ('completed_at', pa.timestamp('s')),
+    ('epic_id', pa.int64()),
+    ('iteration_id', pa.int64()),
+    ('workflow_state_id', pa.int64()),
+    ('requested_by_id', pa.string()),
+    ('owner_ids', pa.list_(pa.string())),
+    ('labels', pa.list_(pa.string())),
+    (PARTITION_COLUMN, pa.string()),
+])
+
+# epics and members keep a few typed columns for filtering plus the full API JSON
+ENTITY_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('name', pa.string()),
+    ('created_at', pa.timestamp('s')),
+    ('updated_at', pa.timestamp('s')),
+    ('data', pa.string()),
+    (PARTITION_COLUMN, pa.string()),
+])
+
+
+def _month(value: datetime) -> str:
+    return value.strftime('%Y-%m') if value else 'unknown'
+
+
+def _timestamp(value: str) -> datetime:
+    # entity timestamps may carry fractional seconds, story ones are pre-parsed
+    if not value:
+        return None
+    return parse_timestamp(value[:19] + 'Z')
+
+
+def stories_table(stories: List[Story]) -> pa.Table:
+    return pa.Table.from_pylist([{
+        'id': story.id,
+        'name': story.name,
+        'story_type': story.story_type,
+        'app_url': story.app_url,
+        'created_at': story.created_at,
+        'updated_at': story.updated_at,
+        'completed': story.completed,
+        'completed_at': story.completed_at,
+        'epic_id': story.epic_id,
+        'iteration_id': story.iteration_id,
+        'workflow_state_id': story.workflow_state_id,
+        'requested_by_id': story.requested_by_id,
+        'owner_ids': list(story.owner_ids),
+        'labels': list(story.labels),
+        PARTITION_COLUMN: _month(story.created_at),
+    } for story in stories], schema=STORY_SCHEMA)
+
+
+def entities_table(entities: List[Dict[str, Any]]) -> pa.Table:
+    rows = []
+    for entity in entities:
+        created_at = _timestamp(entity.get('created_at'))
+        rows.append({
+            'id': str(entity['id']),
+            'name': entity.get('name') or entity.get('profile', {}).get('name'),
+            'created_at': created_at,
+            'updated_at': _timestamp(entity.get('updated_at')),
+            'data': json.dumps(entity),
+            PARTITION_COLUMN: _month(created_at),
+        })
+    return pa.Table.from_pylist(rows, schema=ENTITY_SCHEMA)
+
+
+def write_partitioned(table: pa.Table, path: str) -> None:
+    # months present in `table` are rewritten, other months on disk are left alone
+    ds.write_dataset(
+        table,
+        path,
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+        existing_data_behavior='delete_matching',
+        basename_template='part-{i}.parquet',
+    )
+
+
+def export_snapshot(gateway, root: str = None) -> Dict[str, int]:
+    """
+    Writes every story (from the gateway's story index), epic and member to
+    `root/<dataset>/created_month=YYYY-MM/` Parquet partitions. Returns the
+    row count per dataset.
+    """
+    root = root or os.getenv('SHORTCUT_PARQUET_PATH', 'shortcut_parquet')
+    gateway.story_index.ensure_loaded()
+    tables = {
+        'stories': stories_table(gateway.story_index.all()),
+        'epics': entities_table(gateway._list_entities('epics') or []),
+        'members': entities_table(gateway._list_entities('members') or []),
+    }
+    for name, table in tables.items():
+        write_partitioned(table, os.path.join(root, name))
+    return {name: table.num_rows for name, table in tables.items()}
+
+
+def load_table(root: str, name: str, start_month: str = None, end_month: str = None) -> pa.Table:
+    """
+    Reads one dataset, memory-mapping the Parquet files, and keeps only the
+    `YYYY-MM` partitions between `start_month` and `end_month` (inclusive).
+    """
+    dataset = ds.dataset(
+        os.path.join(root, name),
+        format='parquet',
+        partitioning='hive',
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    month = ds.field(PARTITION_COLUMN)
+    condition = None
+    if start_month is not None:
+        condition = month >= start_month
+    if end_month is not None:
+        condition = month <= end_month if condition is None else condition & (month <= end_month)
+    return dataset.to_table(filter=condition)
+
+
+def load_frame(root: str, name: str, start_month: str = None, end_month: str = None) -> pd.DataFrame:
+    # Arrow-backed columns: no copy into numpy object arrays
+    return load_table(root, name, start_month, end_month).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def load_story_frame(root: str, start_month: str = None, end_month: str = None) -> pd.DataFrame:
+    # same columns and NumPy dtypes as shortcut_metrics.story_frame, so
+    # epic_metrics/period_activity run on it directly
+    columns = ['id', 'name', 'story_type', 'created_at', 'completed_at', 'completed', 'labels']
+    frame = load_table(root, 'stories', start_month, end_month).select(columns).to_pandas()
+    frame['created_at'] = frame['created_at'].astype('datetime64[ns]')
+    frame['completed_at'] = frame['completed_at'].astype('datetime64[ns]')
+    frame['completed'] = frame['completed'].astype(bool)
+    frame['labels'] = frame['labels'].map(list)
+    return frame.sort_values('id', ignore_index=True)
+
+
+if __name__ == "__main__":
+    # One-off export: python shortcut_parquet.py
+    from shortcut_utils import ShortcutGateway
+    print(export_snapshot(ShortcutGateway()))
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+import httpx
+import requests
+from tenacity import retry_if_exception, stop_after_attempt, wait_exponential
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # tab renders, button clicks
+    BACKGROUND = 1   # cache warm-ups, mirror sync
+
+
+class RateLimitScheduler:
+    """
+    Token bucket shared by every Shortcut request. Callers block in
+    `acquire` until a token is free; waiting INTERACTIVE requests always go
+    before BACKGROUND ones, FIFO within a priority. A 429 (or a Retry-After
+    header) pauses the whole bucket so concurrent callers back off together.
+    """
+    def __init__(self, requests_per_minute: int = 200, burst: int = 20):
+        self.rate = requests_per_minute / 60
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        # seconds callers have spent waiting in acquire, summed over requests
+        self.queued_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def default_priority(self) -> Priority:
+        return getattr(self._local, 'priority', Priority.INTERACTIVE)
+
+    @contextmanager
+    def background(self):
+        # requests made from this thread inside the block queue behind interactive ones
+        previous = self.default_priority
+        self._local.priority = Priority.BACKGROUND
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def acquire(self, priority: Priority = None) -> None:
+        if priority is None:
+            priority = self.default_priority
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            queued_at = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiters[0] == ticket and self._tokens >= 1 and now >= self._paused_until:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1
+                    self.queued_seconds += now - queued_at
+                    self._cond.notify_all()
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.01)
+                self._cond.wait(timeout=wait)
+
+    def refill(self) -> None:
+        # a full bucket and no pause, e.g. so benchmark runs don't inherit each other's waits
+        with self._cond:
+            self._tokens = float(self.capacity)
+            self._updated = time.monotonic()
+            self._paused_until = 0.0
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self._cond.notify_all()
+
+    def observe(self, status_code: int, headers) -> None:
+        # feed every response back so rate-limit replies throttle everyone
+        retry_after = retry_after_seconds(headers)
+        if status_code == 429:
+            # no hint from the server: wait long enough to refill the bucket
+            self.pause(retry_after if retry_after is not None else self.capacity / self.rate)
+        elif retry_after is not None:
+            self.pause(retry_after)
+
+
+def retry_after_seconds(headers) -> float:
+    value = headers.get('Retry-After') if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def is_retryable(exception: BaseException) -> bool:
+    # 429s, 5xxs and dropped connections; other 4xxs will not get better on retry
+    if isinstance(exception, (requests.exceptions.HTTPError, httpx.HTTPStatusError)) and exception.response is not None:
+        return exception.response.status_code == 429 or exception.response.status_code >= 500
+    return isinstance(exception, (
+        requests.exceptions.ConnectionError, requests.exceptions.Timeout, httpx.TransportError
+    ))
+
+
+# tenacity settings shared by the sync and async gateways
+RETRY_POLICY = dict(
+    retry=retry_if_exception(is_retryable),
+    wait=wait_exponential(multiplier=0.5, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
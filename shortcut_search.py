@@ -0,0 +1,100 @@
+import bisect
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+from shortcut_models import Story
+
+_TAG_PATTERN = re.compile(r'\[(.*?)\]')
+_TERM_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def story_tags(name: str) -> List[str]:
+    # words inside [bracket] prefixes, e.g. "[ui api] Fix login" -> ["ui", "api"]
+    return [tag for match in _TAG_PATTERN.findall(name or '') for tag in match.split(" ") if tag]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TERM_PATTERN.findall((text or '').lower())
+
+
+class TitleIndex:
+    """
+    Inverted index over story titles: bracket tags -> story ids and
+    lowercased title terms -> story ids. Kept current by `apply(old, new)`
+    (see StoryIndex.add_listener), so keyword counts and term search never
+    re-scan the story names.
+    """
+    def __init__(self):
+        self._tags: Dict[int, Tuple[str, ...]] = {}
+        self._terms: Dict[int, Tuple[str, ...]] = {}
+        self._by_tag: Dict[str, set] = defaultdict(set)
+        self._by_term: Dict[str, set] = defaultdict(set)
+        # sorted terms for prefix lookups, rebuilt lazily after the term set changes
+        self._vocabulary: List[str] = None
+        self._lock = threading.Lock()
+
+    def _remove(self, story_id: int) -> None:
+        for postings, keys in ((self._by_tag, self._tags.pop(story_id, ())), (self._by_term, self._terms.pop(story_id, ()))):
+            for key in keys:
+                postings[key].discard(story_id)
+                if not postings[key]:
+                    del postings[key]
+                    self._vocabulary = None
+
+    def apply(self, old: Story, new: Story) -> None:
+        with self._lock:
+            if old is not None:
+                self._remove(old.id)
+            if new is not None:
+                self._remove(new.id)
+                tags = tuple(dict.fromkeys(story_tags(new.name)))
+                terms = tuple(dict.fromkeys(tokenize(new.name)))
+                self._tags[new.id] = tags
+                self._terms[new.id] = terms
+                for tag in tags:
+                    self._by_tag[tag].add(new.id)
+                for term in terms:
+                    if term not in self._by_term:
+                        self._vocabulary = None
+                    self._by_term[term].add(new.id)
+
+    def tags_for(self, story: Story) -> Tuple[str, ...]:
+        tags = self._tags.get(story.id)
+        return tags if tags is not None else tuple(dict.fromkeys(story_tags(story.name)))
+
+    def keyword_frequency(self, stories: Iterable[Story] = None) -> Counter:
+        # tag -> number of stories carrying it, over `stories` or the whole index
+        with self._lock:
+            if stories is None:
+                return Counter({tag: len(story_ids) for tag, story_ids in self._by_tag.items()})
+            return Counter(tag for story in stories for tag in self.tags_for(story))
+
+    def search(self, query: str, limit: int = 50) -> List[int]:
+        """
+        Story ids whose title contains every term of `query` (the last term
+        may be a prefix, for search-as-you-type), stories matching more of
+        the terms as bracket tags first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._by_term)
+            *complete, last = terms
+            matches = set()
+            position = bisect.bisect_left(self._vocabulary, last)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(last):
+                matches |= self._by_term[self._vocabulary[position]]
+                position += 1
+            for term in complete:
+                matches &= self._by_term.get(term, set())
+                if not matches:
+                    return []
+
+            def score(story_id):
+                tags = {tag.lower() for tag in self._tags[story_id]}
+                return (-sum(1 for term in terms if term in tags), -story_id)
+
+            return sorted(matches, key=score)[:limit]
@@ -0,0 +1,343 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Tuple
+from urllib.parse import urlencode, urlparse, parse_qs
+from shortcut_models import SHORTCUT_TIMESTAMP_FORMAT
+
+# the objectives ShortcutGateway.get_stories_between_dates reads
+MAIN_OBJECTIVES = [23491, 13782, 18604]
+
+WORKFLOW_STATES = [
+    (500000001, 'Draft'),
+    (500000002, 'Ready for Development'),
+    (500000003, 'In Development'),
+    (500000004, 'Eng Blocked'),
+    (500000005, 'Completed / In Prod'),
+    (500000006, 'Duplicate / Unneeded'),
+]
+COMPLETED_STATE = 500000005
+
+_SEARCH_TERM = re.compile(r'(!?)(\w+):("[^"]*"|\S+)')
+
+
+def synthetic_workspace(epics: int = 9, stories_per_epic: int = 100, members: int = 8,
+                        days: int = 180, seed: int = 0, stories_without_epic: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    A reproducible workspace in the Shortcut API's JSON shapes: `epics`
+    spread over MAIN_OBJECTIVES, `stories_per_epic` stories each (plus
+    `stories_without_epic` outside any epic) created over the last `days`
+    days, with tagged titles, customer labels and owners drawn from `members`.
+    """
+    rng = random.Random(seed)
+    # naive UTC, like the story timestamps
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+    def fmt(value: datetime) -> str:
+        return value.strftime(SHORTCUT_TIMESTAMP_FORMAT) if value else None
+
+    member_list = [{
+        'id': f"00000000-0000-0000-0000-{i:012d}",
+        'disabled': False,
+        'profile': {'name': f"Member {i}", 'mention_name': f"member{i}"},
+    } for i in range(members)]
+    member_ids = [member['id'] for member in member_list]
+    objectives = [{
+        'id': objective_id,
+        'name': f"Objective {objective_id}",
+        'created_at': fmt(now - timedelta(days=days)),
+        'updated_at': fmt(now),
+    } for objective_id in MAIN_OBJECTIVES]
+    epic_list = [{
+        'id': 1000 + i,
+        'name': f"Epic {i}",
+        'completed': False,
+        'objective_ids': [MAIN_OBJECTIVES[i % len(MAIN_OBJECTIVES)]],
+        'created_at': fmt(now - timedelta(days=days)),
+        'updated_at': fmt(now),
+    } for i in range(epics)]
+    iterations = [{
+        'id': 2000 + i,
+        'name': f"Sprint {i}",
+        'start_date': (now - timedelta(days=days - 14 * i)).strftime('%Y-%m-%d'),
+        'end_date': (now - timedelta(days=days - 14 * (i + 1))).strftime('%Y-%m-%d'),
+    } for i in range(days // 14 + 1)]
+
+    tags = ['ui', 'api', 'infra', 'eval', 'sdk', 'docs']
+    labels = ['customer/acme', 'customer/globex', 'customer/initech', 'bug', 'tech-debt']
+    stories = []
+    epic_ids = [epic['id'] for epic in epic_list for _ in range(stories_per_epic)] + [None] * stories_without_epic
+    for epic_id in epic_ids:
+        story_id = 10000 + len(stories)
+        created_at = now - timedelta(minutes=rng.randint(0, days * 24 * 60))
+        completed = rng.random() < 0.6
+        completed_at = created_at + timedelta(minutes=rng.randint(30, 30 * 24 * 60)) if completed else None
+        if completed_at and completed_at > now:
+            completed_at = now
+        state = COMPLETED_STATE if completed else rng.choice([s for s, _ in WORKFLOW_STATES if s != COMPLETED_STATE])
+        iteration = next((it for it in iterations if it['start_date'] <= fmt(created_at)[:10] < it['end_date']), None)
+        stories.append({
+            'id': story_id,
+            'name': f"[{' '.join(rng.sample(tags, rng.randint(1, 2)))}] Story {story_id}",
+            'story_type': rng.choice(['feature', 'bug', 'chore']),
+            'app_url': f"https://app.shortcut.com/standin/story/{story_id}",
+            'created_at': fmt(created_at),
+            'updated_at': fmt(completed_at or created_at),
+            'completed': completed,
+            'completed_at': fmt(completed_at),
+            'epic_id': epic_id,
+            'iteration_id': iteration['id'] if iteration else None,
+            'workflow_state_id': state,
+            'requested_by_id': rng.choice(member_ids),
+            'owner_ids': rng.sample(member_ids, rng.randint(0, 2)),
+            'labels': [{'name': label} for label in rng.sample(labels, rng.randint(0, 2))],
+        })
+
+    return {
+        'members': member_list,
+        'workflows': [{
+            'id': 500000000,
+            'name': 'Engineering',
+            'states': [{'id': state_id, 'name': name} for state_id, name in WORKFLOW_STATES],
+            'updated_at': fmt(now),
+        }],
+        'objectives': objectives,
+        'epics': epic_list,
+        'iterations': iterations,
+        'stories': stories,
+    }
+
+
+def record_workspace(gateway, path: str, objective_ids: List[int] = None) -> Dict[str, int]:
+    """
+    Captures the live payloads the dashboard reads (members, workflows,
+    iterations, the objectives' epics and those epics' stories) into a JSON
+    file the stand-in can serve. Returns the count per collection.
+    """
+    objective_ids = objective_ids or MAIN_OBJECTIVES
+    base = gateway._base_url
+    workspace = {
+        'members': gateway.make_api_call(f"{base}/v3/members") or [],
+        'workflows': gateway.make_api_call(f"{base}/v3/workflows") or [],
+        'iterations': gateway.make_api_call(f"{base}/v3/iterations") or [],
+        'objectives': [],
+        'epics': [],
+        'stories': [],
+    }
+    for objective_id in objective_ids:
+        objective = gateway.make_api_call(f"{base}/v3/objectives/{objective_id}")
+        if objective:
+            workspace['objectives'].append(objective)
+        for epic in gateway.make_api_call(f"{base}/v3/objectives/{objective_id}/epics") or []:
+            epic.setdefault('objective_ids', [objective_id])
+            workspace['epics'].append(epic)
+            workspace['stories'].extend(gateway.make_api_call(f"{base}/v3/epics/{epic['id']}/stories") or [])
+    with open(path, 'w') as f:
+        json.dump(workspace, f)
+    return {name: len(items) for name, items in workspace.items()}
+
+
+def load_workspace(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path) as f:
+        return json.load(f)
+
+
+class ShortcutStandIn:
+    """
+    Local HTTP stand-in for the Shortcut v3 API, serving a recorded or
+    synthetic workspace with `latency` (+ up to `jitter`) seconds added to
+    every response. Requests are counted per route so a benchmark can tell
+    how many calls an entry point made.
+
+        stand_in = ShortcutStandIn(synthetic_workspace(), latency=0.05)
+        gateway._base_url = stand_in.start()
+    """
+    def __init__(self, workspace: Dict[str, List[Dict[str, Any]]], latency: float = 0.0, jitter: float = 0.0,
+                 search_limit: int = 1000):
+        self.latency = latency
+        self.jitter = jitter
+        # like Shortcut, searches stop paging after this many results while `total` counts them all
+        self.search_limit = search_limit
+        self._server = None
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._load(workspace)
+
+    def _load(self, workspace: Dict[str, List[Dict[str, Any]]]) -> None:
+        self._collections = {name: workspace.get(name, []) for name in ('members', 'workflows', 'objectives', 'epics', 'iterations')}
+        self._by_id = {
+            name: {str(item['id']): item for item in items}
+            for name, items in list(self._collections.items()) + [('stories', workspace.get('stories', []))]
+        }
+        self._stories_by_epic = defaultdict(list)
+        self._stories_by_iteration = defaultdict(list)
+        for story in workspace.get('stories', []):
+            self._stories_by_epic[story.get('epic_id')].append(story)
+            self._stories_by_iteration[story.get('iteration_id')].append(story)
+        self._epics_by_objective = defaultdict(list)
+        for epic in self._collections['epics']:
+            for objective_id in epic.get('objective_ids') or [epic.get('milestone_id')]:
+                self._epics_by_objective[objective_id].append(epic)
+        self._state_ids = {
+            state['name']: state['id']
+            for workflow in self._collections['workflows'] for state in workflow.get('states', [])
+        }
+        self._member_ids = {member['profile'].get('mention_name'): member['id'] for member in self._collections['members']}
+        self._iteration_ids = {iteration['name']: iteration['id'] for iteration in self._collections['iterations']}
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self._counts.values())
+
+    def request_counts(self) -> Dict[str, int]:
+        # route (e.g. '/v3/epics/{id}/stories') -> requests served since the last reset
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def _count(self, route: str) -> None:
+        with self._lock:
+            self._counts[route] += 1
+
+    def route(self, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        # (status, JSON body) for one GET, path relative to the API root
+        parts = path.strip('/').split('/')
+        if parts[:1] != ['v3'] or len(parts) < 2:
+            return 404, {'message': 'not found'}
+        parts = parts[1:]
+        name = parts[0]
+        if parts == ['search', 'stories']:
+            self._count('/v3/search/stories')
+            return self._search(params)
+        if len(parts) == 1 and name in self._collections:
+            self._count(f"/v3/{name}")
+            return 200, self._collections[name]
+        if len(parts) == 2 and name in self._by_id:
+            self._count(f"/v3/{name}/{{id}}")
+            entity = self._by_id[name].get(parts[1])
+            return (200, entity) if entity is not None else (404, {'message': 'not found'})
+        if len(parts) == 3:
+            self._count(f"/v3/{name}/{{id}}/{parts[2]}")
+            entity_id = _as_id(parts[1])
+            if name == 'epics' and parts[2] == 'stories':
+                return 200, self._stories_by_epic.get(entity_id, [])
+            if name == 'iterations' and parts[2] == 'stories':
+                return 200, self._stories_by_iteration.get(entity_id, [])
+            if name == 'objectives' and parts[2] == 'epics':
+                return 200, self._epics_by_objective.get(entity_id, [])
+        return 404, {'message': 'not found'}
+
+    def _search(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        # the StoryQuery subset the gateway sends; `next` is an offset into the matches
+        try:
+            predicates = [self._predicate(key, value.strip('"'), bool(negate))
+                          for negate, key, value in _SEARCH_TERM.findall(params.get('query', ''))]
+        except ValueError as e:
+            return 400, {'message': str(e)}
+        page_size = int(params.get('page_size', 25))
+        offset = int(params.get('next', 0))
+        matches = [story for story in self._by_id['stories'].values() if all(p(story) for p in predicates)]
+        page = matches[:self.search_limit][offset:offset + page_size]
+        next_page = None
+        if offset + page_size < min(len(matches), self.search_limit):
+            next_page = "/api/v3/search/stories?" + urlencode(dict(params, next=offset + page_size))
+        return 200, {'data': page, 'next': next_page, 'total': len(matches)}
+
+    def _predicate(self, key: str, value: str, negate: bool):
+        if key == 'epic':
+            predicate = lambda story: story.get('epic_id') == int(value)
+        elif key in ('created', 'updated'):
+            start, _, end = value.partition('..')
+            field = f"{key}_at"
+            predicate = lambda story: (start == '*' or story[field][:10] >= start) and (end in ('*', '') or story[field][:10] <= end)
+        elif key == 'owner':
+            member_id = self._member_ids.get(value)
+            predicate = lambda story: member_id in story.get('owner_ids', [])
+        elif key == 'iteration':
+            iteration_id = self._iteration_ids.get(value)
+            predicate = lambda story: story.get('iteration_id') == iteration_id
+        elif key == 'has' and value == 'epic':
+            predicate = lambda story: story.get('epic_id') is not None
+        elif key == 'state':
+            state_id = self._state_ids.get(value)
+            predicate = lambda story: story.get('workflow_state_id') == state_id
+        else:
+            raise ValueError(f"unsupported search operator: {key}")
+        return (lambda story: not predicate(story)) if negate else predicate
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        # port 0 picks a free one; returns the base URL to point a gateway at
+        if self._server is None:
+            self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="shortcut-standin", daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _as_id(value: str):
+    return int(value) if value.isdigit() else value
+
+
+def _handler_for(stand_in: ShortcutStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        # keep-alive, so pooled sessions reuse connections as they would against Shortcut
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not self.headers.get('Shortcut-Token'):
+                self._reply(401, {'message': 'missing Shortcut-Token'})
+                return
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            status, body = stand_in.route(url.path.removeprefix('/api'), params)
+            delay = stand_in.latency + (random.uniform(0, stand_in.jitter) if stand_in.jitter else 0)
+            if delay:
+                time.sleep(delay)
+            self._reply(status, body)
+
+        def _reply(self, status: int, body: Any) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    # Serve a synthetic (or recorded) workspace for manual runs of the app:
+    #   python shortcut_standin.py [recording.json]
+    # then set the gateway's _base_url to the printed URL.
+    import sys
+    workspace = load_workspace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_workspace()
+    stand_in = ShortcutStandIn(workspace, latency=0.05)
+    print(f"Shortcut stand-in at {stand_in.start(port=8766)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stand_in.stop()
@@ -1,15 +1,26 @@
 import requests
-from datetime import datetime
-from typing import List, Dict, Any
-from tqdm import tqdm
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Tuple
 from IPython.display import display, HTML
 from collections import defaultdict, Counter
 import streamlit as st
 import pandas as pd
 from datetime import timedelta
 import os
+import time
+import asyncio
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from utils.common_utils import CODE_RED_DAYS_AFTER
+from shortcut_models import Story, ResolvedStory, SearchIncomplete, check_search_page, next_search_params
+from shortcut_async import AsyncShortcutGateway
+from shortcut_scheduler import RateLimitScheduler, Priority, RETRY_POLICY
+from tenacity import Retrying
+from shortcut_metrics import story_frame, epic_metrics
+from shortcut_cube import MetricsCube
+from shortcut_search import TitleIndex
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +36,21 @@ active_states = {'In Review', 'Merged to Main', 'In Development', 'Completed / I
 not_worked_on_states = {'Draft', 'Upcoming (Future Sprint)', 'Ready for Development (Current Sprint)'}
 blocked_states = {'Eng Blocked'}
 
+def classify_workstream(objective_name: str, epic_name: str) -> str:
+    if objective_name == PRODUCT_ROADMAP_OBJECTIVE:
+        return "Roadmap"
+    elif epic_name == CUSTOMER_ISSUES_EPIC:
+        return "Customer Issues"
+    elif epic_name == PIOTR_EPIC:
+        return "Piotr"
+    elif epic_name == ON_CALL_EPIC:
+        return "On Call"
+    elif epic_name == BACKEND_ENHANCEMENTS_EPIC:
+        return "Backend Enhancements"
+    elif epic_name == UI_CORE_EPIC:
+        return "UI Core"
+    return "Other Things"
+
 class DisplayUtils:
 
     def display_epics_results(self, display_string, results, code_red_days_after, start_date, end_date, 
@@ -108,6 +134,444 @@ class DisplayUtils:
 
         display(HTML(display_string))
 
+def _drain(generator):
+    # runs a generator to the end and returns its return value
+    while True:
+        try:
+            next(generator)
+        except StopIteration as stop:
+            return stop.value
+
+
+class TTLIndex:
+    """
+    Base for in-memory lookups that are loaded in one shot and rebuilt
+    once they are older than `ttl` seconds. After a failed load no new
+    attempt is made for `retry_interval` seconds; lookups meanwhile see the
+    previous contents, or nothing. Subclasses implement `_load`.
+    """
+    def __init__(self, ttl: float, retry_interval: float = 30):
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._loaded_at = None
+        self._failed_at = None
+        # one load at a time; sessions arriving mid-load wait for it instead of loading again
+        self._load_lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def _backing_off(self) -> bool:
+        return self._failed_at is not None and time.monotonic() - self._failed_at <= self.retry_interval
+
+    def _load_due(self) -> bool:
+        return self.is_stale() and not self._backing_off()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+        self._failed_at = None
+
+    def ensure_loaded(self) -> None:
+        if self._load_due():
+            with self._load_lock:
+                if self._load_due():
+                    self._refresh()
+
+    def refresh(self) -> None:
+        # reloads even if fresh, but not while backing off from a failure
+        with self._load_lock:
+            if not self._backing_off():
+                self._refresh()
+
+    def _refresh(self) -> None:
+        # caller holds _load_lock
+        self._loaded(self._load())
+
+    def _loaded(self, complete: bool) -> None:
+        if complete:
+            self._loaded_at = time.monotonic()
+            self._failed_at = None
+        else:
+            self._failed_at = time.monotonic()
+
+    def _load(self) -> bool:
+        raise NotImplementedError
+
+
+class MemberDirectory(TTLIndex):
+    """
+    All workspace members from one `/v3/members` call, indexed by id and by
+    display name.
+    """
+    def __init__(self, gateway: "ShortcutGateway", ttl: float = 30 * 60):
+        super().__init__(ttl)
+        self._gateway = gateway
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._id_by_name: Dict[str, str] = {}
+
+    def _load(self) -> bool:
+        members = self._gateway._list_entities('members')
+        if members is None:
+            return False
+        self._by_id = {member['id']: member for member in members}
+        self._id_by_name = {}
+        for member in members:
+            name = member.get('profile', {}).get('name')
+            # prefer the active account when a name is shared with a disabled one
+            if name and (name not in self._id_by_name or not member.get('disabled')):
+                self._id_by_name[name] = member['id']
+        return True
+
+    def get(self, member_id: str) -> Dict[str, Any]:
+        self.ensure_loaded()
+        return self._by_id.get(member_id)
+
+    def name_for(self, member_id: str) -> str:
+        member = self.get(member_id)
+        if member is None:
+            return 'Unknown'
+        return member.get('profile', {}).get('name', 'Unknown')
+
+    def mention_name_for(self, member_id: str) -> str:
+        member = self.get(member_id)
+        if member is None:
+            return None
+        return member.get('profile', {}).get('mention_name')
+
+    def id_for(self, name: str) -> str:
+        self.ensure_loaded()
+        return self._id_by_name.get(name)
+
+    def active_names(self) -> List[str]:
+        self.ensure_loaded()
+        return sorted(
+            member['profile']['name'] for member in self._by_id.values()
+            if member['disabled'] == False
+        )
+
+
+class WorkflowRegistry(TTLIndex):
+    """
+    Workflow state id -> state name for every workflow in the workspace.
+    `version` is derived from each workflow's `updated_at`, so a refresh that
+    finds nothing changed keeps the existing map.
+    """
+    def __init__(self, gateway: "ShortcutGateway", ttl: float = 60 * 60, miss_refresh_interval: float = 60):
+        super().__init__(ttl)
+        self._gateway = gateway
+        self._state_names: Dict[int, str] = {}
+        self.version = None
+        self.miss_refresh_interval = miss_refresh_interval
+
+    def _load(self) -> bool:
+        workflows = self._gateway._list_entities('workflows')
+        if workflows is None:
+            return False
+        version = tuple(sorted((workflow['id'], workflow.get('updated_at')) for workflow in workflows))
+        if version != self.version:
+            self._state_names = {
+                state['id']: state['name']
+                for workflow in workflows
+                for state in workflow['states']
+            }
+            self.version = version
+        return True
+
+    def name_for(self, workflow_state_id: int) -> str:
+        self.ensure_loaded()
+        name = self._state_names.get(workflow_state_id)
+        loaded_at = self._loaded_at
+        if name is None and (loaded_at is None or time.monotonic() - loaded_at > self.miss_refresh_interval):
+            # an unknown id usually means a state was added since the last load;
+            # refresh() backs off after a failed load, so an outage costs one call
+            self.refresh()
+            name = self._state_names.get(workflow_state_id)
+        return name or 'Unknown'
+
+    def states(self) -> Dict[int, str]:
+        self.ensure_loaded()
+        return dict(self._state_names)
+
+
+class EntityCache:
+    """
+    Id -> entity cache for one Shortcut entity type (`epics`, `objectives`).
+    Entries expire individually after `ttl` seconds. `warm` fills the whole
+    cache from the list endpoint in a single call; misses fall back to the
+    single-entity endpoint.
+    """
+    def __init__(self, gateway: "ShortcutGateway", entity_type: str, ttl: float):
+        self._gateway = gateway
+        self.entity_type = entity_type
+        self.ttl = ttl
+        self._entries: Dict[int, Any] = {}
+        self._warmed_at = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at <= self.ttl
+
+    def prime(self, entities: List[Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for entity in entities:
+                self._entries[entity['id']] = (now, entity)
+
+    def warm(self, force: bool = False) -> None:
+        if not force and self._warmed_at is not None and self._is_fresh(self._warmed_at):
+            return
+        entities = self._gateway._list_entities(self.entity_type)
+        if entities is None:
+            return
+        now = time.monotonic()
+        # swap in a complete map so concurrent readers never see it half-filled
+        entries = {entity['id']: (now, entity) for entity in entities}
+        with self._lock:
+            self._entries = entries
+            self._warmed_at = now
+
+    def get(self, entity_id: int) -> Dict[str, Any]:
+        if entity_id is None:
+            return None
+        entry = self._entries.get(entity_id)
+        if entry is not None and self._is_fresh(entry[0]):
+            return entry[1]
+        entity = self._gateway._get_entity(self.entity_type, entity_id)
+        if entity is not None:
+            with self._lock:
+                self._entries[entity_id] = (time.monotonic(), entity)
+        return entity
+
+    def get_many(self, entity_ids, bulk_threshold: int = 5) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolves each distinct id once. With more than `bulk_threshold` misses
+        one list call is cheaper than that many single-entity calls.
+        """
+        entity_ids = {entity_id for entity_id in entity_ids if entity_id is not None}
+        missing = [
+            entity_id for entity_id in entity_ids
+            if entity_id not in self._entries or not self._is_fresh(self._entries[entity_id][0])
+        ]
+        if len(missing) > bulk_threshold:
+            self.warm(force=True)
+        return {entity_id: self.get(entity_id) for entity_id in entity_ids}
+
+    def all(self) -> List[Dict[str, Any]]:
+        self.warm()
+        with self._lock:
+            return [entity for _, entity in self._entries.values()]
+
+    def invalidate(self, entity_id: int = None) -> None:
+        with self._lock:
+            if entity_id is None:
+                self._entries = {}
+                self._warmed_at = None
+            else:
+                self._entries.pop(entity_id, None)
+
+
+class StoryQuery:
+    """
+    Builds a query string for Shortcut's `/v3/search/stories` endpoint, e.g.
+    StoryQuery().epic(21023).created_between(start, end).exclude_state('Duplicate / Unneeded')
+    """
+    def __init__(self):
+        self._terms: List[str] = []
+
+    def _add(self, term: str) -> "StoryQuery":
+        self._terms.append(term)
+        return self
+
+    def created_between(self, start, end) -> "StoryQuery":
+        return self._add(f"created:{start.strftime('%Y-%m-%d')}..{end.strftime('%Y-%m-%d')}")
+
+    def updated_between(self, start, end) -> "StoryQuery":
+        return self._add(f"updated:{start.strftime('%Y-%m-%d')}..{end.strftime('%Y-%m-%d')}")
+
+    def without_epic(self) -> "StoryQuery":
+        return self._add("!has:epic")
+
+    def owner(self, mention_name: str) -> "StoryQuery":
+        return self._add(f"owner:{mention_name}")
+
+    def epic(self, epic_id: int) -> "StoryQuery":
+        return self._add(f"epic:{epic_id}")
+
+    def iteration(self, iteration_name: str) -> "StoryQuery":
+        return self._add(f'iteration:"{iteration_name}"')
+
+    def exclude_state(self, state_name: str) -> "StoryQuery":
+        return self._add(f'!state:"{state_name}"')
+
+    def build(self) -> str:
+        return " ".join(self._terms)
+
+    def __str__(self) -> str:
+        return self.build()
+
+
+# Shortcut (then Clubhouse) launched in 2014, so no story was created before this
+SHORTCUT_EPOCH = datetime(2014, 1, 1)
+
+
+class StoryIndex(TTLIndex):
+    """
+    Workspace-wide story store with owner id -> story ids (primary and
+    secondary owners) and epic id -> story ids inverted indexes; label
+    questions are answered by the metrics cube. The first load backfills
+    every epic plus the stories outside any epic; after that a refresh
+    only pulls stories updated since the last one, and stories the
+    gateway fetches for other views are folded in as they arrive. Sessions
+    that ask while a load is running wait for it rather than loading again.
+    Listeners are called with (old, new) for every story that changes.
+    """
+    def __init__(self, gateway: "ShortcutGateway", ttl: float = 5 * 60):
+        super().__init__(ttl)
+        self._gateway = gateway
+        self._stories: Dict[int, Story] = {}
+        self._by_owner: Dict[str, set] = defaultdict(set)
+        self._by_epic: Dict[int, set] = defaultdict(set)
+        self._synced_at: datetime = None
+        self._listeners = []
+        self._lock = threading.RLock()
+
+    def add_listener(self, listener) -> None:
+        self._listeners.append(listener)
+
+    def _load(self) -> bool:
+        return _drain(self._load_stories())
+
+    def stream_load(self) -> Iterator[List[Story]]:
+        """
+        ensure_loaded for callers that render while a load runs: yields each
+        batch of stories (one per epic during the first backfill) as it lands
+        in the index. Yields nothing if the index is fresh or backing off
+        from a failed load; a caller arriving mid-load waits for it, then
+        gets nothing either.
+        """
+        if not self._load_due():
+            return
+        with self._load_lock:
+            if not self._load_due():
+                return
+            self._loaded((yield from self._load_stories()))
+
+    def _load_stories(self) -> Iterator[List[Story]]:
+        # yields batches as they are indexed; returns whether the load completed
+        # naive UTC, like the story timestamps
+        started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        if self._synced_at is None:
+            complete = yield from self._backfill()
+        else:
+            if self._gateway._serve_from_mirror():
+                stories = self._gateway.mirror.stories_updated_since(self._synced_at)
+            else:
+                # back off a day: the search index works in whole days and lags writes
+                stories = self._gateway.search_stories_by_range(
+                    StoryQuery.updated_between, self._synced_at - timedelta(days=1), datetime.now() + timedelta(days=1)
+                )
+            complete = stories is not None
+            if complete:
+                self.upsert(stories)
+                yield stories
+        if complete:
+            self._synced_at = started_at
+        return complete
+
+    def _backfill(self) -> Iterator[List[Story]]:
+        # every epic's stories as each arrives, then the epic-less ones; returns whether every fetch succeeded
+        if self._gateway._serve_from_mirror():
+            stories = self._gateway.mirror.all_stories()
+            self.upsert(stories)
+            yield stories
+            return True
+        epics = self._gateway._list_entities('epics')
+        if epics is None:
+            return False
+        complete = True
+        for epic_id, stories in self._gateway._fetch_stories_concurrently([epic['id'] for epic in epics]):
+            if stories is None:
+                complete = False
+                continue
+            self.replace_epic(epic_id, stories)
+            yield stories
+        epicless = self._gateway.search_epicless_stories()
+        if epicless is None:
+            return False
+        self.replace_epic(None, epicless)
+        yield epicless
+        return complete
+
+    def upsert(self, stories: List[Story]) -> None:
+        with self._lock:
+            for story in stories:
+                current = self._stories.get(story.id)
+                if current is not None:
+                    if current.updated_at and story.updated_at and current.updated_at >= story.updated_at:
+                        continue
+                    self._unlink(current)
+                self._stories[story.id] = story
+                for owner_id in story.owner_ids:
+                    self._by_owner[owner_id].add(story.id)
+                self._by_epic[story.epic_id].add(story.id)
+                for listener in self._listeners:
+                    listener(current, story)
+
+    def remove(self, story_id: int) -> None:
+        with self._lock:
+            story = self._stories.pop(story_id, None)
+            if story is not None:
+                self._unlink(story)
+                for listener in self._listeners:
+                    listener(story, None)
+
+    def replace_epic(self, epic_id: int, stories: List[Story]) -> None:
+        """
+        Upserts a complete fetch of one epic's stories (None: the epic-less
+        ones) and removes the indexed stories filed under it that the fetch no
+        longer has, i.e. deleted or moved to another epic, so listeners retract
+        them too.
+        """
+        with self._lock:
+            self.upsert(stories)
+            fetched = {story.id for story in stories}
+            for story_id in list(self._by_epic.get(epic_id, ())):
+                if story_id not in fetched:
+                    self.remove(story_id)
+
+    def remove_epic(self, epic_id: int) -> None:
+        with self._lock:
+            for story_id in list(self._by_epic.get(epic_id, ())):
+                self.remove(story_id)
+
+    def _unlink(self, story: Story) -> None:
+        for postings, keys in ((self._by_owner, story.owner_ids), (self._by_epic, (story.epic_id,))):
+            for key in keys:
+                story_ids = postings.get(key)
+                if story_ids is not None:
+                    story_ids.discard(story.id)
+                    if not story_ids:
+                        del postings[key]
+
+    def get(self, story_id: int) -> Story:
+        self.ensure_loaded()
+        return self._stories.get(story_id)
+
+    def peek(self, story_id: int) -> Story:
+        # like get, without triggering a load
+        return self._stories.get(story_id)
+
+    def all(self) -> List[Story]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._stories.values())
+
+    def stories_for_owner(self, owner_id: str) -> List[Story]:
+        self.ensure_loaded()
+        with self._lock:
+            return [self._stories[story_id] for story_id in self._by_owner.get(owner_id, ())]
+
+
 class ShortcutGateway:
     def __init__(self):
         self._base_url = 'https://api.app.shortcut.com/api'
@@ -118,53 +582,209 @@ class ShortcutGateway:
         #     "Authorization": f"Bearer {self._token}",
         #     "Content-Type": "application/json",
         # }
+        # Cap on parallel story fetches in fetch_stories_for_epics
+        self.max_concurrency = int(os.getenv('SHORTCUT_MAX_CONCURRENCY', 8))
+        # Let Shortcut filter by date/owner/epic/state instead of pulling whole epics
+        self.server_side_search = os.getenv('SHORTCUT_SERVER_SEARCH', '1') != '0'
+        # Optional local SQLite mirror (see shortcut_mirror.py), set via attach_mirror
+        self.mirror = None
+        # 'threads' or 'async' (httpx, see shortcut_async.py) for fetch_stories_for_epics
+        self.fetch_mode = os.getenv('SHORTCUT_FETCH_MODE', 'threads')
+        # async mode's event loop thread and pooled client, started on first use and kept until close()
+        self._async_lock = threading.Lock()
+        self._async_loop = None
+        self._async_thread = None
+        self._async_client = None
         self.session = requests.Session()
+        # token travels in a header rather than the query string, so it stays out of URLs and logs
+        self.session.headers.update({"Shortcut-Token": self._token})
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        # Every request waits its turn here; see shortcut_scheduler.py
+        self.scheduler = RateLimitScheduler(
+            requests_per_minute=int(os.getenv('SHORTCUT_RATE_LIMIT_PER_MINUTE', 200))
+        )
         self._iteration_map = dict()
-
-    def make_api_call(self, url: str, additional_params: Dict[str, Any] = {}) -> Any:
+        # The gateway is shared by every session (st.cache_resource) and each
+        # script run has its own thread, so per-request state is thread-local
+        self._request = threading.local()
+        # Set while a webhook receiver (shortcut_webhooks.py) applies changes as they happen.
+        # Epic stories fetched meanwhile are shared across requests and patched by
+        # each change; the whole store is dropped every live_snapshot_ttl seconds
+        # as a backstop for missed deliveries.
+        self.live_updates = False
+        self.live_snapshot_ttl = float(os.getenv('SHORTCUT_LIVE_SNAPSHOT_TTL', 15 * 60))
+        self._live_stories: Dict[int, List[Story]] = {}
+        self._live_started_at: float = None
+        self._live_lock = threading.Lock()
+        self.members = MemberDirectory(self)
+        self.workflows = WorkflowRegistry(self)
+        self.epics = EntityCache(self, 'epics', ttl=5 * 60)
+        self.objectives = EntityCache(self, 'objectives', ttl=30 * 60)
+        self.story_index = StoryIndex(self)
+        # Daily counts per (date, epic, owner, label), fed by every story change
+        self.metrics_cube = MetricsCube(code_red_days_after=CODE_RED_DAYS_AFTER)
+        self.story_index.add_listener(self.metrics_cube.apply)
+        # Bracket tags and title terms of every indexed story
+        self.title_index = TitleIndex()
+        self.story_index.add_listener(self.title_index.apply)
+
+    @property
+    def _story_snapshot(self) -> Dict[int, List[Story]]:
+        # Per-request story snapshot: epic id -> stories. Reads go through
+        # _snapshot_stories and only invalidate_story_snapshot() clears it.
+        snapshot = getattr(self._request, 'story_snapshot', None)
+        if snapshot is None:
+            snapshot = self._request.story_snapshot = {}
+        return snapshot
+
+    def _snapshot_stories(self, epic_id: int) -> List[Story]:
+        # the request's copy of an epic's stories, seeded from the live store; None if neither has it
+        snapshot = self._story_snapshot
+        if epic_id not in snapshot and self.live_updates:
+            with self._live_lock:
+                if self._live_started_at is None or time.monotonic() - self._live_started_at > self.live_snapshot_ttl:
+                    self._live_stories.clear()
+                    self._live_started_at = time.monotonic()
+                if epic_id in self._live_stories:
+                    snapshot[epic_id] = self._live_stories[epic_id]
+        return snapshot.get(epic_id)
+
+    def _keep_stories(self, epic_id: int, stories: List[Story]) -> None:
+        # a complete fetch of one epic: into the snapshot, the live store and the story index
+        self._story_snapshot[epic_id] = stories
+        if self.live_updates:
+            with self._live_lock:
+                self._live_stories.setdefault(epic_id, stories)
+        self.story_index.replace_epic(epic_id, stories)
+
+    def make_api_call(self, url: str, additional_params: Dict[str, Any] = {}, priority: Priority = None) -> Any:
         try:
-            response = self.session.get(
-                f"{url}?token={self._token}",
-                timeout=10, 
-                params=additional_params,
-            )
-            response.raise_for_status()
-            return response.json()
+            for attempt in Retrying(**RETRY_POLICY):
+                with attempt:
+                    self.scheduler.acquire(priority)
+                    response = self.session.get(
+                        url,
+                        timeout=10, 
+                        params=additional_params,
+                    )
+                    self.scheduler.observe(response.status_code, response.headers)
+                    response.raise_for_status()
+                    return response.json()
         except requests.exceptions.RequestException as e:
             print(f"API call failed: {e}")
             return None
 
+    def attach_mirror(self, mirror) -> None:
+        self.mirror = mirror
+
+    def _serve_from_mirror(self) -> bool:
+        return self.mirror is not None and self.mirror.is_ready()
+
+    def _list_entities(self, entity_type: str) -> List[Dict[str, Any]]:
+        if self._serve_from_mirror():
+            return self.mirror.entities(entity_type)
+        return self.make_api_call(f"{self._base_url}/v3/{entity_type}")
+
+    def _get_entity(self, entity_type: str, entity_id) -> Dict[str, Any]:
+        if self._serve_from_mirror():
+            entity = self.mirror.entity(entity_type, entity_id)
+            if entity is not None:
+                return entity
+        return self.make_api_call(f"{self._base_url}/v3/{entity_type}/{entity_id}")
+
     # @lru_cache(maxsize=1)  # Cache the result of iterations for quick reuse
     def _load_iterations(self) -> None:
-        all_iterations = self.make_api_call(f"{self._base_url}/v3/iterations")
+        all_iterations = self._list_entities('iterations')
         if all_iterations:
             self._iteration_map = {iteration['name']: iteration for iteration in all_iterations}
 
-    # @lru_cache(maxsize=1)  # Cache workflows to avoid repeated API calls
     def _create_workflows_map(self) -> Dict[int, str]:
-        workflows_dict: Dict[int, str] = {}
-        workflows = self.make_api_call(f"{self._base_url}/v3/workflows")
-        if workflows:
-            for workflow in workflows:
-                for state in workflow['states']:
-                    workflows_dict[state['id']] = state['name']
-        return workflows_dict
+        return self.workflows.states()
 
     def extract_keywords(self, stories):
-        keywords = set()
-        import re
-        for story in stories:
-            matches = re.findall(r'\[(.*?)\]', story['name'])
-            for match in matches:
-                keywords.update(match.split(" "))
-        return list(keywords)
+        # bracket tags of the stories, most frequent first, read from the title index
+        return [keyword for keyword, _ in self.title_index.keyword_frequency(stories).most_common()]
+
+    def search_story_titles(self, query: str, limit: int = 50) -> List[Story]:
+        self.story_index.ensure_loaded()
+        return [self.story_index.peek(story_id) for story_id in self.title_index.search(query, limit)]
 
     def get_owner_id(self, person_name):
-        owner_info = self.make_api_call(f"{self._base_url}/v3/members")
-        for owner in owner_info:
-            if owner['profile']['name'] == person_name:
-                return owner['id']
-        return None
+        return self.members.id_for(person_name)
+
+    def get_stories_for_owner(self, owner_id: str, start_date: datetime = None, end_date: datetime = None) -> List[Story]:
+        # every story with `owner_id` among its owners, optionally only those created in [start_date, end_date]
+        stories = self.story_index.stories_for_owner(owner_id)
+        if start_date is not None and end_date is not None:
+            stories = [story for story in stories if story.created_at and start_date <= story.created_at <= end_date]
+        return sorted(stories, key=lambda story: story.created_at or datetime.min)
+
+    def iter_stories_for_owner(self, owner_id: str, start_date: datetime = None, end_date: datetime = None) -> Iterator[List[Story]]:
+        """
+        get_stories_for_owner as it arrives, unsorted. With a date range and
+        a story index that needs loading, one owner-scoped search answers
+        instead; otherwise (or if the search fails) the owner's stories from
+        each epic as the index backfills it, then whatever else the index
+        holds. Each story is yielded once.
+        """
+        def matches(story: Story) -> bool:
+            if owner_id not in story.owner_ids:
+                return False
+            return start_date is None or end_date is None or bool(story.created_at and start_date <= story.created_at <= end_date)
+
+        if start_date is not None and end_date is not None and self.story_index.is_stale():
+            stories = self._search_stories_for_owner(owner_id, start_date, end_date)
+            if stories is not None:
+                batch = [story for story in stories if matches(story)]
+                if batch:
+                    yield batch
+                return
+        seen = set()
+        for stories in self.story_index.stream_load():
+            batch = [story for story in stories if story.id not in seen and matches(story)]
+            seen.update(story.id for story in batch)
+            if batch:
+                yield batch
+        rest = [story for story in self.get_stories_for_owner(owner_id, start_date, end_date) if story.id not in seen]
+        if rest:
+            yield rest
+
+    def _search_stories_for_owner(self, owner_id: str, start_date: datetime, end_date: datetime) -> List[Story]:
+        # None when search is off or fails, or the member has no mention name to search by
+        if not self.server_side_search or self._serve_from_mirror():
+            return None
+        mention_name = self.members.mention_name_for(owner_id)
+        if mention_name is None:
+            return None
+        # padded by a day because Shortcut resolves dates in the workspace timezone
+        return self.search_stories_by_range(
+            lambda query, start, end: query.owner(mention_name).created_between(start, end),
+            start_date - timedelta(days=1), end_date + timedelta(days=1)
+        )
+
+    def get_customer_health(self, start_date, end_date) -> pd.DataFrame:
+        """
+        Per-customer (`customer/` label) filed, completed and open counts for
+        stories filed between the dates across the whole workspace, most
+        behind first: by open tickets, then by their average age.
+        """
+        # loading the index pulls every story (then only changes) through the cube
+        self.story_index.ensure_loaded()
+        totals = self.metrics_cube.label_summary(start_date, end_date)
+        df = pd.DataFrame([
+            {
+                "Customer": customer,
+                "Filed": row['filed'],
+                "Completed": row['completed'],
+                "Open": row['open'],
+                "Avg open age (days)": round(row['open_age'] / row['open'], 1) if row['open'] else 0,
+                "Avg days to complete": round(row['days_to_complete'] / row['completed'], 1) if row['completed'] else None,
+                "Code red": row['code_red'],
+            }
+            for customer, row in totals.items()
+        ], columns=["Customer", "Filed", "Completed", "Open", "Avg open age (days)", "Avg days to complete", "Code red"])
+        return df.sort_values(["Open", "Avg open age (days)"], ascending=False, ignore_index=True)
 
     def get_tickets_closed_assigned(self, person_name, start_date_str, end_date_str):
         owner_id = self.get_owner_id(person_name)
@@ -173,27 +793,30 @@ class ShortcutGateway:
         start_date = datetime.strptime(start_date_str, "%d %b %Y")
         end_date = datetime.strptime(end_date_str, "%d %b %Y")
 
-        from datetime import timedelta
-
         for date in range((end_date - start_date).days + 1):
             current_date = start_date + timedelta(days=date)
-            stories_assigned_to_person = [story for story in stories if datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') == current_date]
-            stories_completed_by_person = [story for story in stories_assigned_to_person if story['completed']]
+            stories_assigned_to_person = [
+                story for story in stories if story.created_at and story.created_at.date() == current_date.date()
+            ]
+            stories_completed_by_person = [story for story in stories_assigned_to_person if story.completed]
 
             current_date_str = current_date.strftime("%d %b %Y")
             date_map[current_date_str] = (len(stories_assigned_to_person), len(stories_completed_by_person))
         return date_map
 
     def get_top_owners_for_epic(self, epic_id: int, start_date: datetime=None, end_date: datetime=None) -> List[str]:
-        stories = self.get_stories_for_epic(epic_id)
+        if start_date is not None and end_date is not None:
+            stories = self._get_stories_for_epic_created_between(epic_id, start_date, end_date)
+        else:
+            stories = self.get_stories_for_epic(epic_id)
         if start_date is not None and end_date is not None:
             start_datetime = datetime.combine(start_date, datetime.min.time())
             end_datetime = datetime.combine(end_date, datetime.max.time())
-            stories = [story for story in stories if start_datetime <= datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') <= end_datetime]
-        completed_stories = [story for story in stories if story['completed']]
-        incomplete_stories = [story for story in stories if not story['completed']]
-        owners_of_completed_stories = [story['owner_ids'] for story in completed_stories]
-        owners_of_incomplete_stories = [story['owner_ids'] for story in incomplete_stories]
+            stories = [story for story in stories if story.created_at and start_datetime <= story.created_at <= end_datetime]
+        completed_stories = [story for story in stories if story.completed]
+        incomplete_stories = [story for story in stories if not story.completed]
+        owners_of_completed_stories = [story.owner_ids for story in completed_stories]
+        owners_of_incomplete_stories = [story.owner_ids for story in incomplete_stories]
         owners_1 = [owner for sublist in owners_of_completed_stories for owner in sublist]
         owners_2 = [owner for sublist in owners_of_incomplete_stories for owner in sublist]
         completed_owner_names = [self.get_owner_name(owner_id) for owner_id in owners_1]
@@ -211,42 +834,79 @@ class ShortcutGateway:
             for name, (completed_count, incomplete_count) in sorted_counts
         ]
 
+    def resolve_stories(self, stories: List[Story]) -> List[ResolvedStory]:
+        """
+        Joins stories with their owner, requester, workflow state, epic and
+        objective names. Every distinct epic/objective id is fetched once (or
+        bulk-loaded), members and workflows come from their directories, and
+        the join itself is a local O(n) pass.
+        """
+        epics = self.epics.get_many(story.epic_id for story in stories)
+        objective_ids = {epic_id: self._objective_id_for_epic(epic) for epic_id, epic in epics.items()}
+        objectives = self.objectives.get_many(objective_ids.values())
+
+        rows = []
+        for story in stories:
+            epic = epics.get(story.epic_id)
+            objective = objectives.get(objective_ids.get(story.epic_id))
+            epic_name = epic.get('name', 'Unknown Epic') if epic else "No Epic"
+            objective_name = objective.get('name', 'Unknown Objective') if objective else "No Objective Associated"
+            rows.append(ResolvedStory(
+                story=story,
+                owner=self.members.name_for(story.owner_ids[0]) if story.owner_ids else "Unassigned",
+                requester=self.members.name_for(story.requested_by_id),
+                state=self.workflows.name_for(story.workflow_state_id),
+                epic_name=epic_name,
+                objective_name=objective_name,
+                workstream=classify_workstream(objective_name, epic_name),
+            ))
+        return rows
+
+    @staticmethod
+    def _objective_id_for_epic(epic: Dict[str, Any]) -> int:
+        if not epic:
+            return None
+        if epic.get('milestone_id'):
+            return epic['milestone_id']
+        objective_ids = epic.get('objective_ids') or []
+        return objective_ids[0] if objective_ids else None
+
     def get_workflow_name(self, workflow_state_id: int) -> str:
-        workflows_dict = self._create_workflows_map()
-        return workflows_dict.get(workflow_state_id, 'Unknown')
+        return self.workflows.name_for(workflow_state_id)
 
     def get_owner_name(self, owner_id: str) -> str:
-        url = f"{self._base_url}/v3/members/{owner_id}"
-        owner_info = self.make_api_call(url)
-        return owner_info.get('profile', {}).get('name', 'Unknown')
+        return self.members.name_for(owner_id)
 
     def get_iteration(self, iteration_name: str) -> Dict[str, Any]:
         self._load_iterations()  # Ensure the cache is populated
         return self._iteration_map.get(iteration_name)
 
+    def warm_entity_cache(self) -> None:
+        self.epics.warm()
+        self.objectives.warm()
+
+    def invalidate_entity_cache(self, entity_type: str = None) -> None:
+        if entity_type in (None, 'epics'):
+            self.epics.invalidate()
+        if entity_type in (None, 'objectives'):
+            self.objectives.invalidate()
+
     def get_all_objectives(self):
-        url = f"{self._base_url}/v3/objectives"
-        objectives = self.make_api_call(url)
         objective_name_to_id_map = {}
-        for objective in objectives:
+        for objective in self.objectives.all():
             objective_name_to_id_map[objective['name']] = objective['id']
         return objective_name_to_id_map
 
     def get_objective_from_id(self, objective_id: int) -> str:
-        objective_url = f"{self._base_url}/v3/objectives/{objective_id}"
-        objective_info = self.make_api_call(objective_url)
-        return objective_info
+        return self.objectives.get(objective_id)
 
     def get_epic_from_id(self, epic_id: int) -> str:
-        epic_url = f"{self._base_url}/v3/epics/{epic_id}"
-        epic_info = self.make_api_call(epic_url)
-        return epic_info
+        return self.epics.get(epic_id)
 
     def get_objective_for_epic(self, epic_id: int) -> str:
         if epic_id is None:
             return "No Epic"
-        epic_url = f"{self._base_url}/v3/epics/{epic_id}"
-        epic_info = self.make_api_call(epic_url)
+        epic_info = self.epics.get(epic_id)
         if not epic_info:
             return "No Epic"
 
@@ -254,38 +914,297 @@ class ShortcutGateway:
         if not objective_id:
             return "No Objective Associated"
 
-        objective_url = f"{self._base_url}/v3/objectives/{objective_id}"
-        objective_info = self.make_api_call(objective_url)
+        objective_info = self.objectives.get(objective_id)
+        if not objective_info:
+            return "Unknown Objective"
         return objective_info.get('name', 'Unknown Objective')
 
     def get_owner_name_from_id(self, owner_id: int) -> str:
-        owner_url = f"{self._base_url}/v3/members/{owner_id}"
-        owner_info = self.make_api_call(owner_url)
-        return owner_info.get('profile', {}).get('name', 'Unknown')
+        return self.members.name_for(owner_id)
 
     def get_objective_for_story(self, story_id: int) -> str:
         story_url = f"{self._base_url}/v3/stories/{story_id}"
         story_info = self.make_api_call(story_url)
+        if not story_info:
+            return "Unknown Epic"
         epic_id = story_info.get('epic_id')
         return self.get_objective_for_epic(epic_id) if epic_id else "Unknown Epic"
 
     def get_epic_for_story(self, story_id: int) -> str:
         story_url = f"{self._base_url}/v3/stories/{story_id}"
         story_info = self.make_api_call(story_url)
+        if not story_info:
+            return "Unknown Epic"
         epic_id = story_info.get('epic_id')
         if not epic_id:
             return "Unknown Epic"
-        epic_url = f"{self._base_url}/v3/epics/{epic_id}"
-        epic_info = self.make_api_call(epic_url)
+        epic_info = self.epics.get(epic_id)
+        if not epic_info:
+            return "Unknown Epic"
         return epic_info.get('name', 'Unknown Epic')
 
-    def get_stories_for_epic(self, epic_id: int) -> List[Dict[str, Any]]:
-        url = f"{self._base_url}/v3/epics/{epic_id}/stories"
-        return self.make_api_call(url) or []
+    @staticmethod
+    def _to_stories(payload: List[Dict[str, Any]]) -> List[Story]:
+        # every story enters the app here, parsed once into a compact record
+        if payload is None:
+            return None
+        return [Story.from_json(story) for story in payload]
+
+    def _fetch_stories_for_epic(self, epic_id: int) -> List[Story]:
+        if self._serve_from_mirror():
+            return self.mirror.stories_for_epic(epic_id)
+        return self._to_stories(self.make_api_call(f"{self._base_url}/v3/epics/{epic_id}/stories"))
+
+    def get_stories_for_epic(self, epic_id: int) -> List[Story]:
+        stories = self._snapshot_stories(epic_id)
+        if stories is not None:
+            return stories
+        stories = self._fetch_stories_for_epic(epic_id)
+        if stories is None:
+            # don't pin a failed fetch into the snapshot
+            return []
+        self._keep_stories(epic_id, stories)
+        return stories
+
+    def iter_search_pages(self, query: StoryQuery, page_size: int = 25) -> Iterator[List[Story]]:
+        """
+        Runs `query` against `/v3/search/stories`, yielding each page's stories
+        as it arrives and following the `next` cursor until the result set is
+        exhausted. Raises SearchIncomplete if a page fails or the result set
+        is larger than Shortcut will page through.
+        """
+        url = f"{self._base_url}/v3/search/stories"
+        params = {'query': str(query), 'page_size': page_size, 'detail': 'full'}
+        returned = 0
+        while params is not None:
+            page = self.make_api_call(url, params)
+            check_search_page(query, page, returned)
+            stories = self._to_stories(page.get('data', []))
+            self.story_index.upsert(stories)
+            returned += len(stories)
+            yield stories
+            params = next_search_params(query, page, returned)
+
+    def search_stories(self, query: StoryQuery, page_size: int = 25) -> List[Story]:
+        # the whole result set, or None if it is incomplete so callers can fall back to a full fetch
+        try:
+            return [story for page in self.iter_search_pages(query, page_size) for story in page]
+        except SearchIncomplete as e:
+            print(f"Story search incomplete, falling back: {e}")
+            return None
+
+    def search_stories_by_range(self, query_for_range, start: datetime, end: datetime) -> List[Story]:
+        """
+        Searches `query_for_range(StoryQuery(), start, end)` over the days
+        start..end, halving the range whenever Shortcut caps the result set so
+        the halves together return every match. Returns None if a search fails
+        or a single day is still over the cap.
+        """
+        try:
+            return [story for page in self.iter_search_pages(query_for_range(StoryQuery(), start, end)) for story in page]
+        except SearchIncomplete as e:
+            days = (end.date() - start.date()).days
+            if not e.truncated or days < 1:
+                print(f"Story search incomplete: {e}")
+                return None
+        middle = start + timedelta(days=days // 2)
+        first = self.search_stories_by_range(query_for_range, start, middle)
+        if first is None:
+            return None
+        second = self.search_stories_by_range(query_for_range, middle + timedelta(days=1), end)
+        if second is None:
+            return None
+        return first + second
+
+    def search_epicless_stories(self) -> List[Story]:
+        # /v3/epics/{id}/stories never returns stories outside an epic, so they are searched for separately
+        return self.search_stories_by_range(
+            lambda query, start, end: query.without_epic().created_between(start, end),
+            SHORTCUT_EPOCH, datetime.now() + timedelta(days=1)
+        )
+
+    @staticmethod
+    def _created_between_query(epic_id: int, start_date, end_date) -> StoryQuery:
+        # padded by a day because Shortcut resolves dates in the workspace timezone
+        return StoryQuery().epic(epic_id).created_between(start_date - timedelta(days=1), end_date + timedelta(days=1))
+
+    def _get_stories_for_epic_created_between(self, epic_id: int, start_date, end_date) -> List[Story]:
+        # Superset of the epic's stories created in [start_date, end_date]; callers
+        # still apply their exact created_at filter.
+        if self._snapshot_stories(epic_id) is not None or not self.server_side_search or self._serve_from_mirror():
+            return self.get_stories_for_epic(epic_id)
+        stories = self.search_stories(self._created_between_query(epic_id, start_date, end_date))
+        if stories is None:
+            return self.get_stories_for_epic(epic_id)
+        return stories
 
-    def get_stories_for_iteration(self, iteration_id: int) -> List[Dict[str, Any]]:
+    def iter_stories_for_epics(self, epic_ids: List[int]) -> Iterator[Tuple[int, List[Story]]]:
+        """
+        Yields (epic_id, stories) for each epic as soon as its stories arrive:
+        snapshot hits first, then fetches in completion order with at most
+        `max_concurrency` in flight. Fetched stories land in the snapshot; a
+        failed fetch yields an empty list and is not pinned. Yields happen on
+        the consuming thread, so the caller may drive Streamlit from the loop.
+        """
+        missing = []
+        for epic_id in dict.fromkeys(epic_ids):
+            stories = self._snapshot_stories(epic_id)
+            if stories is not None:
+                yield epic_id, stories
+            else:
+                missing.append(epic_id)
+        if not missing:
+            return
+        for epic_id, stories in self._fetch_stories_concurrently(missing):
+            if stories is None:
+                yield epic_id, []
+                continue
+            self._keep_stories(epic_id, stories)
+            yield epic_id, stories
+
+    def _fetch_stories_concurrently(self, epic_ids: List[int]) -> Iterator[Tuple[int, List[Story]]]:
+        # (epic_id, stories or None if the fetch failed) in completion order, bypassing the snapshot
+        if self.fetch_mode == 'async' and not self._serve_from_mirror():
+            return self._iter_stories_for_epics_async(epic_ids)
+        return self._iter_stories_for_epics_threaded(epic_ids)
+
+    def _iter_stories_for_epics_threaded(self, epic_ids: List[int]) -> Iterator[Tuple[int, List[Story]]]:
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(epic_ids))) as pool:
+            futures = {pool.submit(self._fetch_stories_for_epic, epic_id): epic_id for epic_id in epic_ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _iter_stories_for_epics_async(self, epic_ids: List[int]) -> Iterator[Tuple[int, List[Story]]]:
+        # the event loop runs on its own thread and hands each epic over as it completes
+        gateway = self._async_gateway()
+        # read on the calling thread, which may be inside scheduler.background()
+        priority = self.scheduler.default_priority
+        results = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for result in gateway.iter_stories_for_epics(epic_ids, priority):
+                    results.put(result)
+            finally:
+                results.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._async_loop)
+        while (result := results.get()) is not done:
+            yield result
+        future.result()
+
+    def fetch_stories_for_epics(self, epic_ids: List[int], on_progress=None) -> Dict[int, List[Story]]:
+        """
+        Loads the stories of every epic in `epic_ids` into the snapshot, at most
+        `max_concurrency` requests in flight. `on_progress(done, total)` is
+        called from the calling thread as each epic finishes, so it is safe to
+        drive Streamlit widgets from it.
+        """
+        missing = [epic_id for epic_id in dict.fromkeys(epic_ids) if self._snapshot_stories(epic_id) is None]
+        for done, _ in enumerate(self.iter_stories_for_epics(missing), start=1):
+            if on_progress:
+                on_progress(done, len(missing))
+        return {epic_id: self._story_snapshot.get(epic_id, []) for epic_id in epic_ids}
+
+    def _async_gateway(self) -> AsyncShortcutGateway:
+        with self._async_lock:
+            if self._async_client is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="shortcut-async-loop", daemon=True)
+                thread.start()
+
+                async def create():
+                    # built on the loop that will use it
+                    return AsyncShortcutGateway(
+                        token=self._token,
+                        base_url=self._base_url,
+                        scheduler=self.scheduler,
+                        max_connections=self.max_concurrency,
+                        per_host_limit=self.max_concurrency,
+                        http2=os.getenv('SHORTCUT_HTTP2') == '1',
+                    )
+
+                self._async_client = asyncio.run_coroutine_threadsafe(create(), loop).result()
+                self._async_loop, self._async_thread = loop, thread
+            return self._async_client
+
+    def close(self) -> None:
+        # releases pooled connections: the requests session and, once async mode has run, its client and loop
+        with self._async_lock:
+            if self._async_client is not None:
+                asyncio.run_coroutine_threadsafe(self._async_client.aclose(), self._async_loop).result()
+                self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+                self._async_thread.join()
+                self._async_loop.close()
+                self._async_loop = self._async_thread = self._async_client = None
+        self.session.close()
+
+    def invalidate_story_snapshot(self, epic_id: int = None) -> None:
+        # Call once at the start of a request (e.g. a button click) so the
+        # rest of the render reads one consistent copy of each epic's stories.
+        if epic_id is None:
+            self._story_snapshot.clear()
+        else:
+            self._story_snapshot.pop(epic_id, None)
+
+    def get_story(self, story_id: int) -> Story:
+        story = self.make_api_call(f"{self._base_url}/v3/stories/{story_id}")
+        return Story.from_json(story) if story else None
+
+    def apply_story_change(self, story: Story) -> None:
+        """
+        Folds a created or updated story into the live store (moving it between
+        epics if needed), the story index (and through it the metrics cube)
+        and the mirror. Runs on the webhook threads, so changes are applied
+        one at a time under the live lock; requests already rendering keep
+        the lists they hold and see the change on the next click.
+        """
+        with self._live_lock:
+            current = self.story_index.peek(story.id)
+            if current is not None and current.updated_at and story.updated_at and current.updated_at > story.updated_at:
+                return
+            self.story_index.upsert([story])
+            self._patch_live_stories(current, story)
+            if self.mirror is not None:
+                self.mirror.upsert_stories([story])
+
+    def apply_story_deletion(self, story_id: int) -> None:
+        with self._live_lock:
+            current = self.story_index.peek(story_id)
+            self.story_index.remove(story_id)
+            self._patch_live_stories(current, None)
+            if self.mirror is not None:
+                self.mirror.delete_story(story_id)
+
+    def apply_epic_deletion(self, epic_id: int) -> None:
+        # Shortcut unlinks the epic's stories; the ones still alive come back with their next update or refresh
+        with self._live_lock:
+            self._live_stories.pop(epic_id, None)
+            self.story_index.remove_epic(epic_id)
+        self.epics.invalidate(epic_id)
+
+    def drop_live_stories(self) -> None:
+        # without deliveries the shared copies go stale; the next live run starts empty
+        with self._live_lock:
+            self._live_stories.clear()
+            self._live_started_at = None
+
+    def _patch_live_stories(self, old: Story, new: Story) -> None:
+        # copy-on-write, so the lists handed to requests never change under them; caller holds _live_lock
+        for story in (old, new):
+            if story is not None and story.epic_id in self._live_stories:
+                self._live_stories[story.epic_id] = [
+                    existing for existing in self._live_stories[story.epic_id] if existing.id != story.id
+                ]
+        if new is not None and new.epic_id in self._live_stories:
+            self._live_stories[new.epic_id].append(new)
+
+    def get_stories_for_iteration(self, iteration_id: int) -> List[Story]:
+        if self._serve_from_mirror():
+            return self.mirror.stories_for_iteration(iteration_id)
         url = f"{self._base_url}/v3/iterations/{iteration_id}/stories"
-        return self.make_api_call(url) or []
+        return self._to_stories(self.make_api_call(url)) or []
 
     def get_stories_between_dates(self, start_date, end_date):
         start_date_dt = datetime.strptime(start_date, '%Y-%m-%d')
@@ -296,85 +1215,121 @@ class ShortcutGateway:
 
         progress_bar = st.progress(0)
 
-        for i, objective_id in tqdm(enumerate(main_objectives)):
-            progress_bar.progress(i / len(main_objectives))
-            epics = self.get_epics_for_objective(objective_id)
-            for epic in epics:
-                stories_for_epic = self.get_stories_for_epic(epic['id'])
-                filtered_stories = [
-                    story for story in stories_for_epic 
-                    if 'created_at' in story and start_date_dt <= datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') <= end_date_dt
-                ]
-                stories.extend(filtered_stories)
-        
+        with ThreadPoolExecutor(max_workers=len(main_objectives)) as pool:
+            epics_per_objective = list(pool.map(self.get_epics_for_objective, main_objectives))
+        epic_ids = [epic['id'] for epics in epics_per_objective for epic in epics]
+
+        stories_per_epic = {}
+        if self.server_side_search and not self._serve_from_mirror():
+            # one date-scoped search per epic; an epic whose search fails or is capped is fetched whole below
+            queries = {
+                epic_id: self._created_between_query(epic_id, start_date_dt, end_date_dt)
+                for epic_id in epic_ids if self._snapshot_stories(epic_id) is None
+            }
+            if queries:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries))) as pool:
+                    futures = {pool.submit(self.search_stories, query): epic_id for epic_id, query in queries.items()}
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        found = future.result()
+                        if found is not None:
+                            stories_per_epic[futures[future]] = found
+                        progress_bar.progress(done / len(futures))
+        missing = [epic_id for epic_id in epic_ids if epic_id not in stories_per_epic]
+        if missing:
+            stories_per_epic.update(self.fetch_stories_for_epics(
+                missing,
+                on_progress=lambda done, total: progress_bar.progress(done / total)
+            ))
+        for epic_id in epic_ids:
+            filtered_stories = [
+                story for story in stories_per_epic[epic_id]
+                if story.created_at and start_date_dt <= story.created_at <= end_date_dt
+            ]
+            stories.extend(filtered_stories)
+
         progress_bar.progress(100)
 
         return stories
 
-    def get_stories(
-        self,
-        iteration_name: str,
-        start_date: str,
-        end_date: str
-    ) -> List[Dict[str, Any]]:
+    def iter_stories(self, iteration_name: str, start_date: str, end_date: str) -> Iterator[List[Story]]:
+        """
+        get_stories as it arrives, unsorted: the iteration's stories created
+        between the dates, minus 'Duplicate / Unneeded', one search page at a
+        time (or in one batch from the iteration endpoint if search is off or
+        comes back incomplete).
+        """
         iteration = self.get_iteration(iteration_name)
         if not iteration:
             print(f"Iteration with name '{iteration_name}' not found.")
-            return []
+            return
 
-        iteration_id = iteration['id']
         start_date_dt = datetime.strptime(start_date, '%Y-%m-%d')
         end_date_dt = datetime.strptime(end_date, '%Y-%m-%d')
 
-        stories = self.get_stories_for_iteration(iteration_id)
-        filtered_stories = [
-            story for story in stories
-            if 'created_at' in story and start_date_dt <= datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') <= end_date_dt
-        ]
-        filtered_stories = [
-            story for story in filtered_stories
-            if self.get_workflow_name(story['workflow_state_id']) != 'Duplicate / Unneeded'
-        ]
+        def keep(story: Story) -> bool:
+            return bool(
+                story.created_at and start_date_dt <= story.created_at <= end_date_dt
+                and self.get_workflow_name(story.workflow_state_id) != 'Duplicate / Unneeded'
+            )
+
+        seen = set()
+        if self.server_side_search and not self._serve_from_mirror():
+            query = (
+                StoryQuery()
+                .iteration(iteration_name)
+                .created_between(start_date_dt - timedelta(days=1), end_date_dt + timedelta(days=1))
+                .exclude_state('Duplicate / Unneeded')
+            )
+            try:
+                for page in self.iter_search_pages(query):
+                    seen.update(story.id for story in page)
+                    batch = [story for story in page if keep(story)]
+                    if batch:
+                        yield batch
+                return
+            except SearchIncomplete as e:
+                print(f"Story search incomplete, falling back: {e}")
+        batch = [story for story in self.get_stories_for_iteration(iteration['id']) if story.id not in seen and keep(story)]
+        if batch:
+            yield batch
 
+    def get_stories(
+        self,
+        iteration_name: str,
+        start_date: str,
+        end_date: str
+    ) -> List[Story]:
+        stories = [story for batch in self.iter_stories(iteration_name, start_date, end_date) for story in batch]
         return sorted(
-            filtered_stories, 
-            key=lambda story: datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ'),
+            stories, 
+            key=lambda story: story.created_at,
             reverse=True
         )
 
     def get_all_owners(self):
-        owner_url = f"{self._base_url}/v3/members"
-        owner_info = self.make_api_call(owner_url)
-        owner_names = [owner['profile']['name'] for owner in owner_info if owner['disabled'] == False]
-        owner_names.sort()
-        return owner_names
+        return self.members.active_names()
 
     def get_epic_name(self, epic_id: int) -> str:
-        epic_url = f"{self._base_url}/v3/epics/{epic_id}"
-        epic_info = self.make_api_call(epic_url)
+        epic_info = self.epics.get(epic_id)
+        if not epic_info:
+            return 'Unknown Epic'
         return epic_info.get('name', 'Unknown Epic')
 
     def get_epics_for_objective(self, objective_id: int, exclude_completed: bool=False) -> List[Dict[str, Any]]:
-        url = f"{self._base_url}/v3/objectives/{objective_id}/epics"
-        epics = self.make_api_call(url) or []
+        if self._serve_from_mirror():
+            epics = self.mirror.epics_for_objective(objective_id)
+        else:
+            url = f"{self._base_url}/v3/objectives/{objective_id}/epics"
+            epics = self.make_api_call(url) or []
+        self.epics.prime(epics)
         if exclude_completed:
             epics = [epic for epic in epics if not epic['completed']]
         return epics
 
     def get_2week_trailing_backlog(self, epic_id: int, start_date: datetime, end_date: datetime) -> list:
-        from datetime import timedelta
-        epic = self.get_epic_from_id(epic_id)
-        tuples = []
-        for i in range((end_date - start_date).days):
-            current_date = start_date + timedelta(days=i)
-            s = (current_date - timedelta(days=14))
-            e = current_date
-            _,_,_,cum_days_filed,_,_,incomplete_count,_,_ = self.explain_epic(epic['id'], s, e)
-            backlog_rate = 0
-            if incomplete_count > 0:
-                backlog_rate = cum_days_filed / incomplete_count
-            tuples.append((current_date, backlog_rate))
-        return tuples
+        # loading the epic folds any changed stories into the cube; the series is then a range-sum
+        self.get_stories_for_epic(epic_id)
+        return self.metrics_cube.trailing_backlog_rate([epic_id], start_date, end_date, window_days=14)
 
     def explain_epic(
             self, 
@@ -383,76 +1338,73 @@ class ShortcutGateway:
             end_date: datetime=datetime.now(), 
             code_red_days_after: int=10):
 
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+        if self._snapshot_stories(epic_id) is not None and code_red_days_after == self.metrics_cube.code_red_days_after:
+            # the whole epic is loaded, so its counts are already in the cube
+            return self._explain_epic_from_cube(epic_id, start_date, end_date, code_red_days_after)
+        stories = self._get_stories_for_epic_created_between(epic_id, start_date, end_date)
 
-        epic_name = self.get_epic_name(epic_id)
-        stories = self.get_stories_for_epic(epic_id)
-
-        stories_in_date_range = [story for story in stories if datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') >= datetime.strptime(start_date_str, '%Y-%m-%d') and datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') <= datetime.strptime(end_date_str, '%Y-%m-%d')]
-        total_stories_before_date = len(stories_in_date_range)
+        metrics = epic_metrics(story_frame(stories), start_date, end_date, code_red_days_after)
+        total_stories_before_date = metrics["total"]
 
         if total_stories_before_date == 0:
             return "No stories", 0, 0, 0, 0, 0, 0, {}, {}
 
-        num_stories_code_red = 0
-        not_yet_completed_count = 0
-        cumulative_days_for_completion = 0
-        completed_count = 0
-        cumulative_days_filed_since = 0
-
-        display_string = f"<h3>Epic: {epic_name}</h3>"
-
-        c1_map = defaultdict(int) # map to store total tickets per customer
-        c2_map = defaultdict(int) # map to store completed tickets per customer
+        # only the last story's line is reported, as before
+        last = metrics["stories"].iloc[-1]
+        num_days_to_complete = metrics["days_to_complete"].iloc[-1]
+        num_days_to_complete = None if pd.isna(num_days_to_complete) else int(num_days_to_complete)
+        days_filed_since = metrics["days_filed_since"].iloc[-1]
+        days_filed_since = None if pd.isna(days_filed_since) else int(days_filed_since)
+        display_string = self._last_story_line(
+            total_stories_before_date, last['id'], last['name'], last['story_type'], last['completed'],
+            num_days_to_complete, days_filed_since, code_red_days_after
+        )
 
-        for i, story in enumerate(stories_in_date_range):
+        num_stories_code_red = metrics["code_red"]
+        completed_count = metrics["completed"]
+        not_yet_completed_count = metrics["not_completed"]
+        cumulative_days_for_completion = metrics["days_for_completion"]
+        cumulative_days_filed_since = metrics["days_filed_since_cumulative"]
+        c1_map = metrics["c1_map"]
+        c2_map = metrics["c2_map"]
 
-            simplified_title = story['name']
+        return display_string, total_stories_before_date, completed_count, not_yet_completed_count, num_stories_code_red, cumulative_days_for_completion, cumulative_days_filed_since, c1_map, c2_map
 
-            created_at = datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ').strftime('%d %b %y')
+    def _explain_epic_from_cube(self, epic_id: int, start_date, end_date, code_red_days_after: int):
+        # explain_epic's numbers as range sums over the cube; the window ends at midnight of end_date
+        start_datetime = datetime.combine(start_date, datetime.min.time())
+        end_datetime = datetime.combine(end_date, datetime.min.time())
+        metrics = self.metrics_cube.epic_summary([epic_id], start_datetime, end_datetime - timedelta(days=1))
+        in_range = [
+            story for story in self._story_snapshot[epic_id]
+            if story.created_at and start_datetime <= story.created_at <= end_datetime
+        ]
+        if metrics["total"] == 0 or not in_range:
+            return "No stories", 0, 0, 0, 0, 0, 0, {}, {}
 
+        last = in_range[-1]
+        num_days_to_complete = None
+        if last.completed and last.completed_at:
+            num_days_to_complete = (last.completed_at.date() - last.created_at.date()).days
+        days_filed_since = (datetime.now().date() - last.created_at.date()).days
+        display_string = self._last_story_line(
+            metrics["total"], last.id, last.name, last.story_type, last.completed,
+            num_days_to_complete, days_filed_since, code_red_days_after
+        )
+        return (display_string, metrics["total"], metrics["completed"], metrics["not_completed"], metrics["code_red"],
+                metrics["days_for_completion"], metrics["days_filed_since_cumulative"], metrics["c1_map"], metrics["c2_map"])
+
+    @staticmethod
+    def _last_story_line(total, story_id, name, story_type, completed, num_days_to_complete, days_filed_since, code_red_days_after) -> str:
+        if completed:
+            x = f"took {num_days_to_complete} day(s) to complete from filing"
+            completed_or_not = "Completed"
+        else:
             num_days_to_complete = None
-
-            completed_at = story.get('completed_at')
-            completed_or_not = "Completed" if story['completed'] else "Not yet completed"
-
-            labels = story.get('labels', [])
-            label_names = [label['name'] for label in labels]
-            if story['completed']:
-                completed_count += 1
-                completed_at = datetime.strptime(completed_at, '%Y-%m-%dT%H:%M:%SZ').strftime('%d %b %y')
-                x = f"took {num_days_to_complete} day(s) to complete from filing"
-                for l in label_names:
-                    if l.startswith('customer/'):
-                        label_name = l.replace('customer/', '')
-                    else:
-                        label_name = l
-                    c2_map[label_name] += 1
-            else:
-                days_filed_since = (datetime.now() - datetime.strptime(created_at, '%d %b %y')).days
-                x = f"been {days_filed_since} day(s) since filing"
-                completed_at = "N/A"
-                cumulative_days_filed_since += days_filed_since
-                not_yet_completed_count += 1
-            for l in label_names:
-                if l.startswith('customer/'):
-                    customer_name = l.replace('customer/', '')
-                else:
-                    customer_name = l
-                c1_map[customer_name] += 1
-
-            if completed_at != "N/A":
-                num_days_to_complete = (datetime.strptime(completed_at, '%d %b %y') - datetime.strptime(created_at, '%d %b %y')).days
-                cumulative_days_for_completion += num_days_to_complete
-
-            color = 'red' if num_days_to_complete and num_days_to_complete > code_red_days_after else 'white'
-            num_stories_code_red += 1 if color == 'red' else 0
-
-            completed_or_not = f"<span style='color: #FF69B4;'>{completed_or_not}</span>" if completed_or_not == "Not yet completed" else completed_or_not
-            display_string = f"<span style='color: {color};'>{i+1}. <a href='https://app.shortcut.com/galileo/story/{story['id']}'>{simplified_title}</a> ({story['story_type']}) -- {x} ({completed_or_not})</span>"
-
-        return display_string, total_stories_before_date, completed_count, not_yet_completed_count, num_stories_code_red, cumulative_days_for_completion, cumulative_days_filed_since, c1_map, c2_map
+            x = f"been {days_filed_since} day(s) since filing"
+            completed_or_not = "<span style='color: #FF69B4;'>Not yet completed</span>"
+        color = 'red' if num_days_to_complete and num_days_to_complete > code_red_days_after else 'white'
+        return f"<span style='color: {color};'>{total}. <a href='https://app.shortcut.com/galileo/story/{story_id}'>{name}</a> ({story_type}) -- {x} ({completed_or_not})</span>"
 
     def explain_epics_from_objective(
             self, 
@@ -467,12 +1419,12 @@ class ShortcutGateway:
 
     def get_first_story_date(self, epic_id: int) -> str:
         stories = self.get_stories_for_epic(epic_id)
-        # ignore the ones where story['created_at'] is None
-        stories = [story for story in stories if story['created_at'] is not None]
+        # ignore the ones where story.created_at is None
+        stories = [story for story in stories if story.created_at is not None]
         # throws min iterable argument is empty
         if len(stories) == 0:
             return datetime.now()
-        return min([datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ') for story in stories])
+        return min(story.created_at for story in stories)
 
     def get_story_tags(self, story_id: int) -> List[str]:
         url = f"{self._base_url}/v3/stories/{story_id}/tags"
@@ -480,28 +1432,8 @@ class ShortcutGateway:
         return tags
 
     def get_completion_rate_for_epic(self, start, end, epic):
-        dates = [start + timedelta(days=i) for i in range((end - start).days)]
-        tuples = []
-        for date in dates:
-            insights, table, c1m, c2m = self.explain_epics(
-                epics=[epic], 
-                start_date=date,
-                end_date=date + timedelta(days=1), 
-                code_red_days_after=CODE_RED_DAYS_AFTER, 
-                verbose=False,
-                show_progress_bar=False
-            )
-            total_tickets = sum(c1m.values())
-            completed_tickets = sum(c2m.values())
-            tuples.append((date, total_tickets, completed_tickets))
-
-        tuples.sort(key=lambda x: x[0], reverse=True)
-        df = pd.DataFrame(tuples, columns=["Date", "Filed", "Completed"])
-        df["Date"] = pd.to_datetime(df["Date"], format="%d %b %Y")
-        df = df.sort_values("Date")
-
-        df_melted = df.melt(id_vars=["Date"], var_name="Category", value_name="Count")
-        return df_melted
+        self.get_stories_for_epic(epic['id'])
+        return self.metrics_cube.daily_filed_completed([epic['id']], start, end)
 
     def get_backlog_rate_for_epic(self, start, end, epic_id):
         res = self.get_2week_trailing_backlog(epic_id=epic_id, start_date=start, end_date=end)
@@ -510,6 +1442,72 @@ class ShortcutGateway:
         df = df.sort_values("Date")
         return df
 
+    def stream_epics(
+            self,
+            epics: List[Dict[str, Any]],
+            start_date: datetime,
+            end_date: datetime=datetime.now(),
+            code_red_days_after: int=10,
+            verbose: bool=False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generator behind explain_epics: yields one result per epic as soon as
+        that epic's stories arrive, so callers can render rows while the rest
+        are still loading. Results come in completion order; `position` is
+        the epic's place in `epics` (see EpicsSummary). With `verbose`,
+        `row_html` is the epic's table row (see EPICS_TABLE_HEADER).
+        """
+        epics_by_id = {epic['id']: epic for epic in epics}
+        positions = {epic_id: position for position, epic_id in enumerate(epics_by_id)}
+        for epic_id, stories in self.iter_stories_for_epics(list(epics_by_id)):
+            epic = epics_by_id[epic_id]
+            filed, completed_in_period, completed_from_before = self.metrics_cube.period_activity([epic_id], start_date, end_date)
+            titles = self._completed_titles(stories, start_date, end_date)
+            result = {
+                'position': positions[epic_id],
+                'epic': epic,
+                'filed': filed,
+                'completed_in_period': completed_in_period,
+                'completed_from_before': completed_from_before,
+                'titles': titles,
+                'explained': None,
+                'row_html': "",
+            }
+            story_title, a, b, c, d, e, f, c1_map, c2_map = self.explain_epic(epic_id, start_date, end_date, code_red_days_after)
+            if story_title != "No stories":
+                result['explained'] = (a, b, c, d, e, f, c1_map, c2_map)
+                if verbose and a > 0:
+                    result['row_html'] = self._epic_row_html(epic, a, b, e, f, start_date, end_date)
+            yield result
+
+    @staticmethod
+    def _completed_titles(stories: List[Story], start_date, end_date) -> List[str]:
+        # stories completed on days start..end and filed no later than end, in story order
+        start_day = datetime.combine(start_date, datetime.min.time()).date()
+        end_day = datetime.combine(end_date, datetime.min.time()).date()
+        return [
+            story.name for story in stories
+            if story.completed and story.completed_at and story.created_at
+            and start_day <= story.completed_at.date() <= end_day and story.created_at.date() <= end_day
+        ]
+
+    def _epic_row_html(self, epic, a, b, e, f, start_date, end_date) -> str:
+        first_story_date = self.get_first_story_date(epic['id']).strftime('%d %b %y')
+        W = f"{b / a * 100:.2f}%"
+        X = a
+        Y = f"{e/b:.2f}" if b > 0 else 'N/A'
+        Z = f"{f:.2f}" if f > 0 else 'N/A'
+        owners = self.get_top_owners_for_epic(epic['id'], start_date, end_date)
+
+        owner_strings = []
+        for owner in owners:
+            first_name = owner.split()[0]
+            counts = owner[owner.find('('):]
+            owner_strings.append(f"{first_name} {counts}")
+        owners = "<br>".join(owner_strings)
+
+        return f"<tr><td><a href='https://app.shortcut.com/galileo/epic/{epic['id']}'>{epic['name']}</a></td><td>{first_story_date}</td><td>{W}</td><td>{X}</td><td>{b}</td><td>{Y}</td><td>{Z}</td><td  style='font-size: 10px;'>{owners}</td></tr>"
+
     def explain_epics(
             self,
             epics: List[Dict[str, Any]],
@@ -519,21 +1517,23 @@ class ShortcutGateway:
             verbose: bool=False,
             show_progress_bar: bool=True
     ):
-        epic_insights = {
-            'num_stories': 0,
-            'completed': 0,
-            'not_completed': 0,
-            'num_stories_code_red': 0,
-            'days_for_completion_cumulative': 0,
-            'days_since_filed_cumulative': 0,
-            'best_epic': None,
-            'worst_epic': None,
-        }
-        min_weighted_score = float('inf')
-        max_weighted_score = float('-inf')
-        epics_table = ""
-        if verbose:
-            epics_table = """
+        summary = EpicsSummary(verbose)
+        if show_progress_bar:
+            progress_bar_x = st.progress(0)
+
+        total = len({epic['id'] for epic in epics})
+        for done, result in enumerate(self.stream_epics(epics, start_date, end_date, code_red_days_after, verbose), start=1):
+            summary.add(result)
+            if show_progress_bar:
+                progress_bar_x.progress(done / total)
+
+        # make progress bar full 
+        if show_progress_bar:
+            progress_bar_x.progress(100)
+
+        return summary.result()
+
+EPICS_TABLE_HEADER = """
             <table style='width: 100%;'><tr>
                 <th>Epic</th>
                 <th>Started on</th>
@@ -545,80 +1545,76 @@ class ShortcutGateway:
                 <th>Owners</th>
             </tr>
             """
-        completion_percent = 0
 
-        if show_progress_bar:
-            progress_bar_x = st.progress(0)
 
-        c1_map_epic_level = defaultdict(int)
-        c2_map_epic_level = defaultdict(int)
+class EpicsSummary:
+    """
+    Collects ShortcutGateway.stream_epics results, which arrive in completion
+    order, and folds them into explain_epics' totals in the epics' input
+    order, so rows, titles and best/worst tie-breaks don't depend on which
+    fetch finished first.
+    """
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self._results: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self._results[result['position']] = result
+
+    def _in_order(self) -> List[Dict[str, Any]]:
+        return [self._results[position] for position in sorted(self._results)]
+
+    def table_html(self) -> str:
+        # the verbose table of the epics added so far, in input order
+        return EPICS_TABLE_HEADER + "".join(result['row_html'] for result in self._in_order()) + "</table>"
 
+    def result(self) -> tuple:
+        epic_insights = {
+            'num_stories': 0,
+            'completed': 0,
+            'not_completed': 0,
+            'num_stories_code_red': 0,
+            'days_for_completion_cumulative': 0,
+            'days_since_filed_cumulative': 0,
+            'best_epic': None,
+            'worst_epic': None,
+        }
+        min_weighted_score = float('inf')
+        max_weighted_score = float('-inf')
+        epics_table = EPICS_TABLE_HEADER if self.verbose else ""
+        c1_map = defaultdict(int)
+        c2_map = defaultdict(int)
         in_week_completed = 0
         in_week_filed = 0
         out_week_completed = 0
         completed_story_titles = []
-        
-        for epic in epics:
-            stories = self.get_stories_for_epic(epic['id'])
-            
-            for story in stories:
-                created_date = datetime.strptime(story['created_at'], "%Y-%m-%dT%H:%M:%SZ").date()
-                
-                if start_date <= created_date <= end_date:
-                    in_week_filed += 1
-                
-                if story['completed'] and story['completed_at']:
-                    completed_date = datetime.strptime(story['completed_at'], "%Y-%m-%dT%H:%M:%SZ").date()
-                    
-                    if start_date <= completed_date <= end_date:
-                        if start_date <= created_date <= end_date:
-                            in_week_completed += 1
-                            completed_story_titles.append(story['name'])
-                        elif created_date < start_date:
-                            out_week_completed += 1
-                            completed_story_titles.append(story['name'])
-
-            first_story_date = self.get_first_story_date(epic['id'])
-
-            first_story_date = first_story_date.strftime('%d %b %y')
-
-            story_title, a, b, c, d, e, f, c1_map, c2_map = self.explain_epic(epic['id'], start_date, end_date, code_red_days_after)
-
-            if story_title == "No stories":
+
+        for result in self._in_order():
+            in_week_filed += result['filed']
+            in_week_completed += result['completed_in_period']
+            out_week_completed += result['completed_from_before']
+            completed_story_titles.extend(result['titles'])
+            if result['explained'] is None:
                 continue
 
-            # loop through both maps and update the epic-level maps
-            for l, c in c1_map.items():
-                c1_map_epic_level[l] += c
-            for l, c in c2_map.items():
-                c2_map_epic_level[l] += c
+            epic = result['epic']
+            a, b, c, d, e, f, epic_c1_map, epic_c2_map = result['explained']
+            for l, count in epic_c1_map.items():
+                c1_map[l] += count
+            for l, count in epic_c2_map.items():
+                c2_map[l] += count
 
-            if a > 0:   
+            if a > 0 and b > 0:
                 completion_percent = b / a
                 days_backlog = f
-                if b > 0:
-                    weighted_score = (completion_percent * 0.25) - ((e / b) * 0.25) - (days_backlog * 0.25)
-                    if weighted_score > max_weighted_score:
-                        max_weighted_score = weighted_score
-                        epic_insights['best_epic'] = f"'{epic['name']}' ({completion_percent * 100:.2f}% complete) with {a} stories, <span style='color: #FF69B4;'>{e/b:.2f} days</span> to complete 1 ticket, {f} days of cumulative backlog."
-                    if weighted_score < min_weighted_score:
-                        min_weighted_score = weighted_score
-                        epic_insights['worst_epic'] = f"'{epic['name']}' ({completion_percent * 100:.2f}% complete) with {a} stories, {e/b:.2f} days to complete 1 ticket, {f} days</span> of cumulative backlog."
-                if verbose:
-                    W = f"{completion_percent*100:.2f}%"
-                    X = a
-                    Y = f"{e/b:.2f}" if b > 0 else 'N/A'
-                    Z = f"{f:.2f}" if f > 0 else 'N/A'
-                    owners = self.get_top_owners_for_epic(epic['id'], start_date, end_date)
-
-                    owner_strings = []
-                    for owner in owners:
-                        first_name = owner.split()[0]
-                        counts = owner[owner.find('('):]
-                        owner_strings.append(f"{first_name} {counts}")
-                    owners = "<br>".join(owner_strings)
-
-                    epics_table += f"<tr><td><a href='https://app.shortcut.com/galileo/epic/{epic['id']}'>{epic['name']}</a></td><td>{first_story_date}</td><td>{W}</td><td>{X}</td><td>{b}</td><td>{Y}</td><td>{Z}</td><td  style='font-size: 10px;'>{owners}</td></tr>"
+                weighted_score = (completion_percent * 0.25) - ((e / b) * 0.25) - (days_backlog * 0.25)
+                if weighted_score > max_weighted_score:
+                    max_weighted_score = weighted_score
+                    epic_insights['best_epic'] = f"'{epic['name']}' ({completion_percent * 100:.2f}% complete) with {a} stories, <span style='color: #FF69B4;'>{e/b:.2f} days</span> to complete 1 ticket, {f} days of cumulative backlog."
+                if weighted_score < min_weighted_score:
+                    min_weighted_score = weighted_score
+                    epic_insights['worst_epic'] = f"'{epic['name']}' ({completion_percent * 100:.2f}% complete) with {a} stories, {e/b:.2f} days to complete 1 ticket, {f} days</span> of cumulative backlog."
+            epics_table += result['row_html']
 
             epic_insights['num_stories'] += a
             epic_insights['completed'] += b
@@ -627,14 +1623,11 @@ class ShortcutGateway:
             epic_insights['days_for_completion_cumulative'] += e
             epic_insights['days_since_filed_cumulative'] += f
 
-        # make progress bar full 
-        if show_progress_bar:
-            progress_bar_x.progress(100)
-
-        if verbose:
+        if self.verbose:
             epics_table += "</table>"
-        
-        return epic_insights, epics_table, c1_map_epic_level, c2_map_epic_level, in_week_completed, in_week_filed, out_week_completed, completed_story_titles
+        return (epic_insights, epics_table, c1_map, c2_map, in_week_completed,
+                in_week_filed, out_week_completed, completed_story_titles)
+
 
 class SprintUtils:
     def __init__(self, shortcut_gateway: ShortcutGateway):
@@ -645,29 +1638,9 @@ class SprintUtils:
         if len(stories) == 0:
             return
 
-        for story in tqdm(stories):
-            owner = "Unassigned"
-            # if it's not assigned, use the requester
-            if len(story['owner_ids']) > 0:
-                owner = self.shortcut_gateway.get_owner_name(story['owner_ids'][0])
-            story_type = story.get('story_type', 'Unknown')
-            story_state = self.shortcut_gateway.get_workflow_name(story['workflow_state_id'])
-            objective_name = self.shortcut_gateway.get_objective(story['id'])
-            epic_name = self.shortcut_gateway.get_epic(story['id'])
-            workstream = "Other Things"
-            if objective_name == PRODUCT_ROADMAP_OBJECTIVE:
-                workstream = "Roadmap"
-            elif epic_name == CUSTOMER_ISSUES_EPIC:
-                workstream = "Customer Issues"
-            elif epic_name == PIOTR_EPIC:
-                workstream = "Piotr"
-            elif epic_name == ON_CALL_EPIC:
-                workstream = "On Call"
-            elif epic_name == BACKEND_ENHANCEMENTS_EPIC:
-                workstream = "Backend Enhancements"
-            elif epic_name == UI_CORE_EPIC:
-                workstream = "UI Core"
-            data.append((story['name'], owner, story_type, story_state, workstream))
+        for row in self.shortcut_gateway.resolve_stories(stories):
+            story_type = row.story.story_type or 'Unknown'
+            data.append((row.story.name, row.owner, story_type, row.state, row.workstream))
 
         complete_states = {'In Review', 'Merged to Main', 'In Development', 'Completed / In Prod'}
         workstream_counts = defaultdict(lambda: {'total': 0, 'complete': 0})
@@ -695,9 +1668,14 @@ class SprintUtils:
         """
         display(HTML(workstream_table_html))
 
-    def analyze(self, stories, total_stories_in_timeframe, heading="Analysis", save_to_file=False, ignore_list=[], person=None):
+    def analyze(self, stories, total_stories_in_timeframe=None, heading="Analysis", save_to_file=False, ignore_list=[], person=None):
+        """
+        `stories` is a list, or an iterable of story batches still being
+        fetched (e.g. ShortcutGateway.iter_stories), whose rows show as each
+        batch arrives; the final layout is then newest first, like get_stories.
+        `total_stories_in_timeframe` defaults to the number of stories seen.
+        """
         display(HTML(f"<h3>{heading}</h3>"))
-        data = []
         style = """
             <style>
                 table {
@@ -723,49 +1701,47 @@ class SprintUtils:
             </tr>
         """
 
-        for story in tqdm(stories):
-            # Get owner name
-            owner = "Unassigned"
-            if len(story['owner_ids']) != 0:
-                owner = self.shortcut_gateway.get_owner(story['owner_ids'][0])
-            if owner in ignore_list:
-                continue
-            # If person is not None, only show stories for that person
-            if ((person is None) or (owner == person)):
-                story_type = story.get('story_type', 'Unknown')
-                story_state = self.shortcut_gateway.get_workflow_name(story['workflow_state_id'])
-                
-                objective = self.shortcut_gateway.get_objective(story['id'])
-                epic = self.shortcut_gateway.get_epic(story['id'])
-
-                workstream = "Other Things"
-                if objective == PRODUCT_ROADMAP_OBJECTIVE:
-                    workstream = "Roadmap"
-                elif epic == CUSTOMER_ISSUES_EPIC:
-                    workstream = "Customer Issues"
-                elif epic == PIOTR_EPIC:
-                    workstream = "Piotr"
-                elif epic == ON_CALL_EPIC:
-                    workstream = "On Call"
-                elif epic == BACKEND_ENHANCEMENTS_EPIC:
-                    workstream = "Backend Enhancements"
-                elif epic == UI_CORE_EPIC:
-                    workstream = "UI Core"
-
-                data.append((story['id'], story['name'], owner, story_type, story_state, workstream))
-                active_color = 'green' if story_type == 'feature' else 'red'
-
-                story_table_html += f"""
-                <tr>
-                    <td>{datetime.strptime(story['created_at'], '%Y-%m-%dT%H:%M:%SZ').strftime('%d %b (%I:%M %p)')}</td>
-                    <td style="color: {active_color};">{story_type}</td>
-                    <td>{workstream}</td>
-                    <td>{owner}</td>
-                    <td>{story_state}</td>
-                    <td><a href="https://app.shortcut.com/galileo/story/{story['id']}">{story['name'][:150]}...</a></td>
-                </tr>
-                """
-        story_table_html += "</table>"
+        streamed = not isinstance(stories, list)
+        batches = stories if streamed else [stories]
+        # two bulk calls up front, so resolving each batch below is all cache hits
+        self.shortcut_gateway.warm_entity_cache()
+        # the table grows in place batch by batch, then gives way to the combined layout below
+        streamed_table = display(HTML(story_table_html + "</table>"), display_id=True)
+        story_rows = []
+        stories_seen = 0
+        for batch in batches:
+            stories_seen += len(batch)
+            for row in self.shortcut_gateway.resolve_stories(batch):
+                story = row.story
+                owner = row.owner
+                if owner in ignore_list:
+                    continue
+                # If person is not None, only show stories for that person
+                if ((person is None) or (owner == person)):
+                    story_type = story.story_type or 'Unknown'
+                    story_state = row.state
+                    workstream = row.workstream
+
+                    active_color = 'green' if story_type == 'feature' else 'red'
+                    story_rows.append((story, (story.id, story.name, owner, story_type, story_state, workstream), f"""
+                    <tr>
+                        <td>{story.created_at.strftime('%d %b (%I:%M %p)')}</td>
+                        <td style="color: {active_color};">{story_type}</td>
+                        <td>{workstream}</td>
+                        <td>{owner}</td>
+                        <td>{story_state}</td>
+                        <td><a href="https://app.shortcut.com/galileo/story/{story.id}">{story.name[:150]}...</a></td>
+                    </tr>
+                    """))
+            if streamed_table is not None:
+                streamed_table.update(HTML(story_table_html + "".join(html for _, _, html in story_rows) + "</table>"))
+        if streamed:
+            # batches land in fetch order
+            story_rows.sort(key=lambda entry: (entry[0].created_at, entry[0].id), reverse=True)
+        data = [row_data for _, row_data, _ in story_rows]
+        story_table_html += "".join(html for _, _, html in story_rows) + "</table>"
+        if total_stories_in_timeframe is None:
+            total_stories_in_timeframe = stories_seen
 
         # Save to file
         if save_to_file:
@@ -835,10 +1811,11 @@ class SprintUtils:
         
         story_count_table_html += "</table>"
         total_tix = len(active_tickets) + len(not_worked_on_tickets) + len(blocked_tickets)
-        print(f"{total_tix/total_stories_in_timeframe * 100:.2f}% of the {total_stories_in_timeframe} stories")
+        if total_stories_in_timeframe:
+            print(f"{total_tix/total_stories_in_timeframe * 100:.2f}% of the {total_stories_in_timeframe} stories")
 
         # instead of displaying one below another, add a parent div and display them side by side
-        display(HTML(f"""
+        layout = HTML(f"""
         <div style="display: flex; align-items: flex-start; justify-content: space-between;">
             <div style="display: inline-block; margin-right: 150px;">
                 {story_count_table_html}
@@ -847,4 +1824,8 @@ class SprintUtils:
                 {story_table_html}
             </div>
         </div>
-        """))
+        """)
+        if streamed_table is not None:
+            streamed_table.update(layout)
+        else:
+            display(layout)
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+import requests
+from shortcut_webhooks import sign, SIGNATURE_HEADER
+
+
+def action_payload(entity_type: str, entity_id: int, action: str) -> dict:
+    # the minimal shape of a Shortcut webhook delivery carrying one action
+    return {
+        'id': f"replay-{entity_type}-{entity_id}-{time.time_ns()}",
+        'changed_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'version': 'v1',
+        'primary_id': entity_id,
+        'actions': [{'id': entity_id, 'entity_type': entity_type, 'action': action}],
+    }
+
+
+def post(url: str, payload: dict, secret: str = None) -> requests.Response:
+    body = json.dumps(payload).encode()
+    headers = {'Content-Type': 'application/json'}
+    if secret:
+        headers[SIGNATURE_HEADER] = sign(body, secret)
+    return requests.post(url, data=body, headers=headers, timeout=10)
+
+
+def main() -> None:
+    # Stands in for Shortcut: replays captured payloads (one JSON object per
+    # line) or single synthetic actions against a running WebhookReceiver.
+    #   python shortcut_webhook_replay.py payloads.jsonl --delay 0.5
+    #   python shortcut_webhook_replay.py --story 12345 --action update
+    parser = argparse.ArgumentParser(description="Replay Shortcut webhook payloads to a local receiver")
+    parser.add_argument('payloads', nargs='?', help="JSONL file of webhook payloads ('-' for stdin)")
+    parser.add_argument('--url', default=f"http://127.0.0.1:{os.getenv('SHORTCUT_WEBHOOK_PORT', 8765)}/")
+    parser.add_argument('--secret', default=os.getenv('SHORTCUT_WEBHOOK_SECRET'))
+    parser.add_argument('--delay', type=float, default=0, help="seconds between deliveries")
+    parser.add_argument('--story', type=int, action='append', default=[], help="story id to send a synthetic action for")
+    parser.add_argument('--epic', type=int, action='append', default=[], help="epic id to send a synthetic action for")
+    parser.add_argument('--action', choices=['create', 'update', 'delete'], default='update')
+    args = parser.parse_args()
+
+    payloads = [action_payload('story', story_id, args.action) for story_id in args.story]
+    payloads += [action_payload('epic', epic_id, args.action) for epic_id in args.epic]
+    if args.payloads:
+        lines = sys.stdin if args.payloads == '-' else open(args.payloads)
+        payloads += [json.loads(line) for line in lines if line.strip()]
+
+    for payload in payloads:
+        response = post(args.url, payload, args.secret)
+        print(response.status_code, response.text)
+        time.sleep(args.delay)
+
+
+if __name__ == "__main__":
+    main()
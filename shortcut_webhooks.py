@@ -0,0 +1,118 @@
+import hashlib
+import hmac
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any
+
+SIGNATURE_HEADER = 'Payload-Signature'
+
+
+def sign(body: bytes, secret: str) -> str:
+    # hex HMAC-SHA256 of the raw body, as Shortcut sends in Payload-Signature
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class WebhookReceiver:
+    """
+    Applies Shortcut outgoing-webhook payloads to a ShortcutGateway's local
+    state: story create/update re-reads the story once and folds it into the
+    live story store, story index, metrics cube and mirror; story delete drops
+    it; epic updates refresh the cached epic and epic deletes also drop its
+    stories. Other entity types are ignored. Payloads must carry a valid
+    Payload-Signature, so a secret is required to start.
+
+        receiver = WebhookReceiver(gateway)
+        receiver.start(port=8765)
+    """
+    def __init__(self, gateway, secret: str = None):
+        self._gateway = gateway
+        self.secret = secret if secret is not None else os.getenv('SHORTCUT_WEBHOOK_SECRET')
+        self._server = None
+
+    def verify(self, body: bytes, signature: str) -> bool:
+        # unsigned deliveries could delete stories from the index, so there is no unsigned mode
+        if not self.secret:
+            return False
+        return signature is not None and hmac.compare_digest(sign(body, self.secret), signature)
+
+    def apply(self, payload: Dict[str, Any]) -> Dict[str, int]:
+        applied = {'stories': 0, 'epics': 0}
+        for action in payload.get('actions', []):
+            entity_type = action.get('entity_type')
+            if entity_type == 'story':
+                self._apply_story(action)
+                applied['stories'] += 1
+            elif entity_type == 'epic':
+                self._apply_epic(action)
+                applied['epics'] += 1
+        return applied
+
+    def _apply_story(self, action: Dict[str, Any]) -> None:
+        story_id = action['id']
+        if action.get('action') == 'delete':
+            self._gateway.apply_story_deletion(story_id)
+            return
+        # webhook actions carry only the changed fields, so read the story once
+        story = self._gateway.get_story(story_id)
+        if story is not None:
+            self._gateway.apply_story_change(story)
+
+    def _apply_epic(self, action: Dict[str, Any]) -> None:
+        epic_id = action['id']
+        if action.get('action') == 'delete':
+            self._gateway.apply_epic_deletion(epic_id)
+        else:
+            self._gateway.epics.invalidate(epic_id)
+            self._gateway.epics.get(epic_id)
+
+    def start(self, host: str = '127.0.0.1', port: int = None) -> None:
+        if self._server is not None:
+            return
+        if not self.secret:
+            raise ValueError("SHORTCUT_WEBHOOK_SECRET is not set; the webhook receiver only accepts signed payloads.")
+        port = port or int(os.getenv('SHORTCUT_WEBHOOK_PORT', 8765))
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        threading.Thread(target=self._server.serve_forever, name="shortcut-webhooks", daemon=True).start()
+        self._gateway.live_updates = True
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._gateway.live_updates = False
+            self._gateway.drop_live_stories()
+
+
+def _handler_for(receiver: WebhookReceiver):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if not receiver.verify(body, self.headers.get(SIGNATURE_HEADER)):
+                self._reply(401, {'error': 'bad signature'})
+                return
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self._reply(400, {'error': 'invalid JSON'})
+                return
+            try:
+                self._reply(200, receiver.apply(payload))
+            except Exception as e:
+                print(f"Shortcut webhook failed: {e}")
+                self._reply(500, {'error': str(e)})
+
+        def _reply(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler